@@ -1,161 +1,130 @@
 import json
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List, Dict, Optional
 import os
-import requests
-from dotenv import load_dotenv
 import datetime
-from apscheduler.schedulers.background import BackgroundScheduler
-import pandas as pd
-from io import BytesIO
-import base64
-import openpyxl
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
 
-load_dotenv()
-BOT_TOKEN = os.getenv("BOT_TOKEN")
-GROUP_CHAT_ID_STR = os.getenv("GROUP_CHAT_ID")
+import images
+import rollups
+from cache import dumps_bytes
+from compression import catalog_snapshots, choose_encoding, weak_etag
+from notifications import GROUP_CHAT_ID, notifier
+from order_sheet import render_order_sheet
+from orders import normalize_order
+from repository import get_repository, project
 
-# Xavfsiz int ga o'tkazish
-if GROUP_CHAT_ID_STR:
-    GROUP_CHAT_ID = int(GROUP_CHAT_ID_STR)
-else:
-    print("ERROR: GROUP_CHAT_ID not found in .env file")
-    GROUP_CHAT_ID = None
+router = APIRouter()
+repo = get_repository()
 
-DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
-PRODUCTS_FILE = os.path.join(DATA_DIR, "products.json")
-CATEGORIES_FILE = os.path.join(DATA_DIR, "categories.json")
-USERS_FILE = os.path.join(DATA_DIR, "users.json")
-ORDERS_FILE = os.path.join(DATA_DIR, "orders.json")
+MAX_PAGE_SIZE = 200
 
-router = APIRouter()
+def json_response(body):
+    return Response(content=body, media_type="application/json")
 
-def read_json(file_path):
-    if not os.path.exists(file_path):
-        return []
-    with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+def parse_date_param(name, value):
+    """?date_from=2025-07-09 yoki to'liq ISO vaqt. Buyurtma vaqtlari mahalliy
+    vaqtda, tz siz saqlanadi, shuning uchun tz li qiymat o'tkaziladi."""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"{name}: noto'g'ri sana")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
 
-def write_json(file_path, data):
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def not_modified(request, etag, modified):
+    """If-None-Match (yoki u bo'lmasa If-Modified-Since) bo'yicha 304 kerakmi"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in if_none_match or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and modified:
+        try:
+            return int(modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
 
-def create_excel_order(order, order_number):
-    """Excel fayl yaratish"""
-    # Excel uchun ma'lumotlarni tayyorlash
-    data = []
-    for i, item in enumerate(order.get('items', []), 1):
-        name = item.get('name', '')
-        quantity = item.get('quantity', 1)
-        price = item.get('price') or item.get('product', {}).get('price') or 0
-        total = int(price) * int(quantity)
-        
-        data.append({
-            '№': i,
-            'MAXSULOT NOMI': name,
-            'O\'LCHAM': 'DONA',
-            'SONI': quantity,
-            'NARXI': price,
-            'UMUMIY SUMMA': total
-        })
-    
-    # DataFrame yaratish
-    df = pd.DataFrame(data)
-    
-    # Excel fayl yaratish
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Buyurtma', index=False)
-        
-        # Excel faylni formatlash
-        workbook = writer.book
-        worksheet = writer.sheets['Buyurtma']
-        
-        # Sarlavhalarni formatlash
-        for col in range(1, 7):
-            cell = worksheet.cell(row=1, column=col)
-            cell.font = openpyxl.styles.Font(bold=True)
-            cell.fill = openpyxl.styles.PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-        
-        # Ustunlar kengligini o'rnatish
-        worksheet.column_dimensions['A'].width = 8   # №
-        worksheet.column_dimensions['B'].width = 30  # MAXSULOT NOMI
-        worksheet.column_dimensions['C'].width = 12  # O'LCHAM
-        worksheet.column_dimensions['D'].width = 10  # SONI
-        worksheet.column_dimensions['E'].width = 15  # NARXI
-        worksheet.column_dimensions['F'].width = 20  # UMUMIY SUMMA
-        
-        # Jami qatorini qo'shish
-        total_row = len(data) + 2
-        worksheet.cell(row=total_row, column=1, value="JAMI")
-        worksheet.cell(row=total_row, column=4, value=sum(item['SONI'] for item in data))
-        worksheet.cell(row=total_row, column=5, value=sum(item['NARXI'] for item in data))
-        worksheet.cell(row=total_row, column=6, value=sum(item['UMUMIY SUMMA'] for item in data))
-        
-        # Jami qatorini formatlash
-        for col in range(1, 7):
-            cell = worksheet.cell(row=total_row, column=col)
-            cell.font = openpyxl.styles.Font(bold=True)
-            cell.fill = openpyxl.styles.PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-        
-        # Ma'lumotlar qismini qo'shish
-        info_row = total_row + 3
-        worksheet.cell(row=info_row, column=1, value="YUBORUVCHI:")
-        worksheet.cell(row=info_row, column=2, value="O'TKIRBEK")
-        worksheet.cell(row=info_row, column=4, value="YUBORUVCHI NOMERI:")
-        worksheet.cell(row=info_row, column=5, value="+998979960020")
-        
-        info_row += 1
-        worksheet.cell(row=info_row, column=1, value="QABUL QILUVCHI:")
-        worksheet.cell(row=info_row, column=2, value=order.get('customerInfo', {}).get('name', '-'))
-        worksheet.cell(row=info_row, column=4, value="Tel raqam:")
-        worksheet.cell(row=info_row, column=5, value=order.get('customerInfo', {}).get('phone', '-'))
-        
-        info_row += 1
-        worksheet.cell(row=info_row, column=1, value="Telegram:")
-        worksheet.cell(row=info_row, column=2, value="@Bronavia0020")
-        worksheet.cell(row=info_row, column=4, value="Jami summa:")
-        worksheet.cell(row=info_row, column=5, value=f"{order.get('total', 0)} so'm")
-        
-        # Ma'lumotlar qismini formatlash
-        for row in range(total_row + 3, info_row + 1):
-            for col in range(1, 6):
-                cell = worksheet.cell(row=row, column=col)
-                if col in [1, 4]:  # Label ustunlari
-                    cell.font = openpyxl.styles.Font(bold=True)
-                    cell.fill = openpyxl.styles.PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid")
-    
-    output.seek(0)
-    return output
+async def catalog_response(kind, request, filters, cursor, limit, fields):
+    """Katalog ro'yxati ETag/Last-Modified bilan. Versiya o'zgarmagan
+    bo'lsa 304 qaytadi va ro'yxat umuman o'qilmaydi."""
+    version, modified = await repo.catalog_version(kind)
+    # Har xil query (sahifa, filtr, fields) - har xil javob
+    query = str(request.query_params)
+    suffix = "-" + hashlib.sha1(query.encode()).hexdigest()[:8] if query else ""
+    headers = {
+        "ETag": f'"{kind}-{version}{suffix}"',
+        "Cache-Control": "no-cache",
+    }
+    if modified:
+        headers["Last-Modified"] = formatdate(modified, usegmt=True)
+    if not_modified(request, headers["ETag"], modified):
+        return Response(status_code=304, headers=headers)
+    if is_full_list(filters, cursor, limit, fields):
+        return await snapshot_response(kind, version, request, headers)
+    response = await list_response(kind, filters, cursor, limit, fields)
+    response.headers.update(headers)
+    return response
 
-def send_order_to_group(order, order_number):
-    print(f"DEBUG: send_order_to_group chaqirildi")
-    print(f"DEBUG: GROUP_CHAT_ID = {GROUP_CHAT_ID}")
-    print(f"DEBUG: BOT_TOKEN = {BOT_TOKEN[:10]}...")
-    
+async def catalog_snapshot(kind, version=None):
+    """Versiya uchun oldindan siqilgan javoblar; yo'q bo'lsa quriladi"""
+    if version is None:
+        version, _ = await repo.catalog_version(kind)
+    variants = catalog_snapshots.get(kind, version)
+    if variants is None:
+        body = await repo.body(kind)
+        variants = await run_in_threadpool(catalog_snapshots.build, kind, version, body)
+    return variants
+
+async def snapshot_response(kind, version, request, headers):
+    """To'liq katalog ro'yxati - tayyor siqilgan baytlar, so'rovda siqish yo'q"""
+    variants = await catalog_snapshot(kind, version)
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    headers["Vary"] = "Accept-Encoding"
+    if encoding is not None and encoding in variants:
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = weak_etag(headers["ETag"])
+    else:
+        encoding = None
+    return Response(content=variants[encoding], media_type="application/json", headers=headers)
+
+def is_full_list(filters, cursor, limit, fields):
+    return cursor is None and limit is None and not fields and all(v is None for v in filters.values())
+
+async def list_response(kind, filters, cursor, limit, fields):
+    """Ro'yxat javobi: parametrsiz - tayyor to'liq ro'yxat (eski format);
+    limit berilsa - {"items", "next_cursor"} sahifasi"""
+    if is_full_list(filters, cursor, limit, fields):
+        return json_response(await repo.body(kind))
+    items, next_cursor = await repo.page(kind, filters, cursor, limit)
+    items = project(items, [f.strip() for f in fields.split(",") if f.strip()] if fields else None)
+    if limit is None:
+        return json_response(dumps_bytes(items))
+    return json_response(dumps_bytes({"items": items, "next_cursor": next_cursor}))
+
+async def send_order_to_group(order, order_number):
+    """Buyurtmani guruhga yuboradi (notifier navbatidagi fon ishi)"""
     if GROUP_CHAT_ID is None:
         print("ERROR: GROUP_CHAT_ID is not set")
         return
     
-    if not BOT_TOKEN:
-        print("ERROR: BOT_TOKEN is not set")
-        return
-    
     # Lokatsiya yuborish
     loc = order.get('customerInfo', {}).get('location', '')
     try:
         if loc and ',' in loc:
             lat, lon = map(float, loc.split(','))
-            url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendLocation"
             payload = {
                 "chat_id": GROUP_CHAT_ID,
                 "latitude": lat,
                 "longitude": lon
             }
-            print(f"DEBUG: Location yuborish - URL: {url}")
-            print(f"DEBUG: Location payload: {payload}")
-            r = requests.post(url, json=payload, timeout=5)
-            print("Telegram location javobi:", r.text)
+            await notifier.call("sendLocation", json=payload)
     except Exception as e:
         print("Telegram location xatolik:", e)
     
@@ -176,26 +145,19 @@ def send_order_to_group(order, order_number):
         text += f"- {name} {quantity} dona = {subtotal} so'm\n"
     text += f"\nJami: {order.get('total', 0)} so'm"
     
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
     payload = {
         "chat_id": GROUP_CHAT_ID,
         "text": text,
         "parse_mode": "HTML"
     }
-    print(f"DEBUG: Xabar yuborish - URL: {url}")
-    print(f"DEBUG: Xabar payload: {payload}")
     try:
-        r = requests.post(url, json=payload, timeout=5)
-        print("Telegram API javobi:", r.text)
-        if r.status_code != 200:
-            print(f"ERROR: Telegram API xatolik - status: {r.status_code}")
+        await notifier.call("sendMessage", json=payload)
     except Exception as e:
         print("Telegram API xatolik:", e)
     
     # Excel fayl yaratish va yuborish
     try:
-        excel_file = create_excel_order(order, order_number)
-        excel_file.seek(0)
+        excel_file = await run_in_threadpool(render_order_sheet, order, order_number)
         
         # Excel faylni yuborish
         files = {'document': ('buyurtma.xlsx', excel_file, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')}
@@ -203,334 +165,33 @@ def send_order_to_group(order, order_number):
             'chat_id': GROUP_CHAT_ID,
             'caption': f'📋 #{order_number}-chi buyurtma Excel fayli'
         }
-        
-        url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendDocument"
-        r = requests.post(url, data=data, files=files, timeout=10)
-        print("Excel fayl yuborildi:", r.text)
+        await notifier.call("sendDocument", data=data, files=files)
         
     except Exception as e:
         print("Excel fayl yuborishda xatolik:", e)
 
-def get_time_period_stats(start_time, end_time, period_name):
-    """Berilgan vaqt oralig'idagi statistikalarni hisoblaydi"""
-    orders = read_json(ORDERS_FILE)
-    product_stats = {}
-    total_sum = 0
-    total_orders = 0
-    customer_orders = []
-    
-    for order in orders:
-        created = order.get('created_at')
-        if not created:
-            continue
-        try:
-            created_dt = datetime.datetime.fromisoformat(created)
-        except Exception:
-            continue
-        if not (start_time <= created_dt < end_time):
-            continue
-        
-        total_orders += 1
-        order_sum = 0
-        customer_name = order.get('customerInfo', {}).get('name', 'Noma\'lum')
-        order_id = order.get('id', 'N/A')
-        
-        for item in order.get('items', []):
-            name = item.get('name', '')
-            quantity = int(item.get('quantity', 1))
-            price = int(item.get('price', 0))
-            item_total = quantity * price
-            order_sum += item_total
-            
-            if name not in product_stats:
-                product_stats[name] = {'quantity': 0, 'total': 0}
-            product_stats[name]['quantity'] += quantity
-            product_stats[name]['total'] += item_total
-        
-        total_sum += order_sum
-        
-        # Mijoz buyurtmasini qo'shamiz
-        items_str = ', '.join([f"{item.get('name', '')} — {item.get('quantity', 1)} dona" for item in order.get('items', [])])
-        customer_orders.append(f"{customer_name} (#{order_id}): {items_str}")
-    
-    return product_stats, total_sum, total_orders, customer_orders
-
-def send_morning_stats():
-    """Ertalab 7:00-10:00 oralig'idagi statistika"""
-    try:
-        now = datetime.datetime.now()
-        today_7 = now.replace(hour=7, minute=0, second=0, microsecond=0)
-        today_10 = now.replace(hour=10, minute=0, second=0, microsecond=0)
-        
-        product_stats, total_sum, total_orders, customer_orders = get_time_period_stats(today_7, today_10, "Ertalab")
-        
-        if not product_stats:
-            stats_text = 'Ertalab 7:00-10:00 oralig\'ida buyurtmalar yo\'q.'
-        else:
-            stats_text = f'📊 Ertalab 7:00-10:00 oralig\'idagi buyurtmalar:\n\n'
-            
-            stats_text += 'Mahsulotlar:\n'
-            for name, data in product_stats.items():
-                stats_text += f'{name} — {data["quantity"]} dona, {data["total"]} so\'m\n'
-            
-            stats_text += f'\nJami buyurtmalar: {total_orders} ta\n'
-            stats_text += f'Jami summa: {total_sum} so\'m\n'
-            
-            if customer_orders:
-                stats_text += '\nMijozlar:\n'
-                for customer_order in customer_orders:
-                    stats_text += f'- {customer_order}\n'
-        
-        url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-        payload = {
-            "chat_id": GROUP_CHAT_ID,
-            "text": stats_text
-        }
-        r = requests.post(url, json=payload, timeout=5)
-        print("Ertalab statistikasi yuborildi:", r.text)
-        
-    except Exception as e:
-        print("Ertalab statistika xatolik:", e)
-
-def send_mid_morning_stats():
-    """Kun o\'rtasi 10:00-13:00 oralig'idagi statistika"""
-    try:
-        now = datetime.datetime.now()
-        today_10 = now.replace(hour=10, minute=0, second=0, microsecond=0)
-        today_13 = now.replace(hour=13, minute=0, second=0, microsecond=0)
-        
-        product_stats, total_sum, total_orders, customer_orders = get_time_period_stats(today_10, today_13, "Kun o'rtasi")
-        
-        if not product_stats:
-            stats_text = 'Kun o\'rtasi 10:00-13:00 oralig\'ida buyurtmalar yo\'q.'
-        else:
-            stats_text = f'📊 Kun o\'rtasi 10:00-13:00 oralig\'idagi buyurtmalar:\n\n'
-            
-            stats_text += 'Mahsulotlar:\n'
-            for name, data in product_stats.items():
-                stats_text += f'{name} — {data["quantity"]} dona, {data["total"]} so\'m\n'
-            
-            stats_text += f'\nJami buyurtmalar: {total_orders} ta\n'
-            stats_text += f'Jami summa: {total_sum} so\'m\n'
-            
-            if customer_orders:
-                stats_text += '\nMijozlar:\n'
-                for customer_order in customer_orders:
-                    stats_text += f'- {customer_order}\n'
-        
-        url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-        payload = {
-            "chat_id": GROUP_CHAT_ID,
-            "text": stats_text
-        }
-        r = requests.post(url, json=payload, timeout=5)
-        print("Kun o'rtasi statistikasi yuborildi:", r.text)
-        
-    except Exception as e:
-        print("Kun o'rtasi statistika xatolik:", e)
-
-def send_afternoon_stats():
-    """Tushdan keyin 13:00-16:00 oralig'idagi statistika"""
-    try:
-        now = datetime.datetime.now()
-        today_13 = now.replace(hour=13, minute=0, second=0, microsecond=0)
-        today_16 = now.replace(hour=16, minute=0, second=0, microsecond=0)
-        
-        product_stats, total_sum, total_orders, customer_orders = get_time_period_stats(today_13, today_16, "Tushdan keyin")
-        
-        if not product_stats:
-            stats_text = 'Tushdan keyin 13:00-16:00 oralig\'ida buyurtmalar yo\'q.'
-        else:
-            stats_text = f'📊 Tushdan keyin 13:00-16:00 oralig\'idagi buyurtmalar:\n\n'
-            
-            stats_text += 'Mahsulotlar:\n'
-            for name, data in product_stats.items():
-                stats_text += f'{name} — {data["quantity"]} dona, {data["total"]} so\'m\n'
-            
-            stats_text += f'\nJami buyurtmalar: {total_orders} ta\n'
-            stats_text += f'Jami summa: {total_sum} so\'m\n'
-            
-            if customer_orders:
-                stats_text += '\nMijozlar:\n'
-                for customer_order in customer_orders:
-                    stats_text += f'- {customer_order}\n'
-        
-        url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-        payload = {
-            "chat_id": GROUP_CHAT_ID,
-            "text": stats_text
-        }
-        r = requests.post(url, json=payload, timeout=5)
-        print("Tushdan keyin statistikasi yuborildi:", r.text)
-        
-    except Exception as e:
-        print("Tushdan keyin statistika xatolik:", e)
-
-def send_evening_stats():
-    """Kechqurun 16:00-19:00 oralig'idagi statistika"""
-    try:
-        now = datetime.datetime.now()
-        today_16 = now.replace(hour=16, minute=0, second=0, microsecond=0)
-        today_19 = now.replace(hour=19, minute=0, second=0, microsecond=0)
-        
-        product_stats, total_sum, total_orders, customer_orders = get_time_period_stats(today_16, today_19, "Kechqurun")
-        
-        if not product_stats:
-            stats_text = 'Kechqurun 16:00-19:00 oralig\'ida buyurtmalar yo\'q.'
-        else:
-            stats_text = f'📊 Kechqurun 16:00-19:00 oralig\'idagi buyurtmalar:\n\n'
-            
-            stats_text += 'Mahsulotlar:\n'
-            for name, data in product_stats.items():
-                stats_text += f'{name} — {data["quantity"]} dona, {data["total"]} so\'m\n'
-            
-            stats_text += f'\nJami buyurtmalar: {total_orders} ta\n'
-            stats_text += f'Jami summa: {total_sum} so\'m\n'
-            
-            if customer_orders:
-                stats_text += '\nMijozlar:\n'
-                for customer_order in customer_orders:
-                    stats_text += f'- {customer_order}\n'
-        
-        url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-        payload = {
-            "chat_id": GROUP_CHAT_ID,
-            "text": stats_text
-        }
-        r = requests.post(url, json=payload, timeout=5)
-        print("Kechqurun statistikasi yuborildi:", r.text)
-        
-    except Exception as e:
-        print("Kechqurun statistika xatolik:", e)
-
-def send_night_stats():
-    """Tungi 19:00-7:00 oralig'idagi statistika"""
-    try:
-        now = datetime.datetime.now()
-        today_19 = now.replace(hour=19, minute=0, second=0, microsecond=0)
-        tomorrow_7 = (now + datetime.timedelta(days=1)).replace(hour=7, minute=0, second=0, microsecond=0)
-        
-        product_stats, total_sum, total_orders, customer_orders = get_time_period_stats(today_19, tomorrow_7, "Tungi")
-        
-        if not product_stats:
-            stats_text = 'Tungi 19:00-7:00 oralig\'ida buyurtmalar yo\'q.'
-        else:
-            stats_text = f'📊 Tungi 19:00-7:00 oralig\'idagi buyurtmalar:\n\n'
-            
-            stats_text += 'Mahsulotlar:\n'
-            for name, data in product_stats.items():
-                stats_text += f'{name} — {data["quantity"]} dona, {data["total"]} so\'m\n'
-            
-            stats_text += f'\nJami buyurtmalar: {total_orders} ta\n'
-            stats_text += f'Jami summa: {total_sum} so\'m\n'
-            
-            if customer_orders:
-                stats_text += '\nMijozlar:\n'
-                for customer_order in customer_orders:
-                    stats_text += f'- {customer_order}\n'
-        
-        url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-        payload = {
-            "chat_id": GROUP_CHAT_ID,
-            "text": stats_text
-        }
-        r = requests.post(url, json=payload, timeout=5)
-        print("Tungi statistikasi yuborildi:", r.text)
-        
-    except Exception as e:
-        print("Tungi statistika xatolik:", e)
-
-def send_all_weeks_stats():
-    import datetime
-    orders = read_json(ORDERS_FILE)
-    # Buyurtmalarni haftalarga ajratamiz
-    weeks = {}
-    for order in orders:
-        created = order.get('created_at')
-        if created:
-            try:
-                created_dt = datetime.datetime.fromisoformat(created)
-            except Exception:
-                continue
-            year, week_num, _ = created_dt.isocalendar()
-            key = f"{year}-yil, {week_num}-hafta"
-            if key not in weeks:
-                weeks[key] = []
-            weeks[key].append(order)
-    # Har bir hafta uchun statistika tuzamiz
-    all_stats = ""
-    for week_key in sorted(weeks.keys()):
-        week_orders = weeks[week_key]
-        product_stats = {}
-        total_sum = 0
-        total_orders = 0
-        customer_orders = []
-        for order in week_orders:
-            total_orders += 1
-            order_sum = 0
-            customer_name = order.get('customerInfo', {}).get('name', 'Noma\'lum')
-            order_id = order.get('id', 'N/A')
-            for item in order.get('items', []):
-                name = item.get('name', '')
-                quantity = int(item.get('quantity', 1))
-                price = int(item.get('price', 0))
-                item_total = quantity * price
-                order_sum += item_total
-                if name not in product_stats:
-                    product_stats[name] = {'quantity': 0, 'total': 0}
-                product_stats[name]['quantity'] += quantity
-                product_stats[name]['total'] += item_total
-            total_sum += order_sum
-            items_str = ', '.join([f"{item.get('name', '')} — {item.get('quantity', 1)} dona" for item in order.get('items', [])])
-            customer_orders.append(f"{customer_name} (#{order_id}): {items_str}")
-        all_stats += f"\n==============================\n"
-        all_stats += f"📅 {week_key} statistikasi:\n\n"
-        if not product_stats:
-            all_stats += "Hafta davomida buyurtmalar yo'q.\n"
-        else:
-            all_stats += 'Mahsulotlar:\n'
-            for name, data in product_stats.items():
-                all_stats += f'{name} — {data["quantity"]} dona, {data["total"]} so\'m\n'
-            all_stats += f'\nJami buyurtmalar: {total_orders} ta\n'
-            all_stats += f'Jami summa: {total_sum} so\'m\n'
-            if customer_orders:
-                all_stats += '\nMijozlar:\n'
-                for customer_order in customer_orders:
-                    all_stats += f'- {customer_order}\n'
-    # txt faylga yozamiz
-    txt_file = os.path.join(DATA_DIR, f"all_weeks_stats.txt")
-    with open(txt_file, "w", encoding="utf-8") as f:
-        f.write(all_stats)
-    # Telegramga fayl yuboramiz
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendDocument"
-    files = {'document': open(txt_file, 'rb')}
-    data = {"chat_id": GROUP_CHAT_ID, "caption": "Barcha haftalar statistikasi"}
-    try:
-        r = requests.post(url, data=data, files=files, timeout=10)
-        print("Barcha haftalar statistikasi fayli yuborildi:", r.text)
-    except Exception as e:
-        print("Barcha haftalar statistikasi fayli xatolik:", e)
-    finally:
-        files['document'].close()
-
-# --- Scheduler ---
-scheduler = BackgroundScheduler()
-# 4 ta vaqt oralig'i uchun statistika
-scheduler.add_job(send_morning_stats, 'cron', hour=10, minute=0)  # Har kuni 10:00 da (7:00-10:00)
-scheduler.add_job(send_mid_morning_stats, 'cron', hour=13, minute=0)  # Har kuni 13:00 da (10:00-13:00)
-scheduler.add_job(send_afternoon_stats, 'cron', hour=16, minute=0)  # Har kuni 16:00 da (13:00-16:00)
-scheduler.add_job(send_evening_stats, 'cron', hour=19, minute=0)  # Har kuni 19:00 da (16:00-19:00)
-scheduler.add_job(send_night_stats, 'cron', hour=7, minute=0)  # Har kuni 7:00 da (19:00-7:00)
-scheduler.add_job(send_all_weeks_stats, 'cron', day_of_week='sun', hour=22, minute=0)  # Yakshanba 22:00 da
-scheduler.start()
-
 # --- PRODUCTS ---
 @router.get("/products")
-def get_products():
-    return read_json(PRODUCTS_FILE)
+async def get_products(
+    request: Request,
+    category_id: Optional[str] = None,
+    in_stock: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+):
+    filters = {"category_id": category_id, "in_stock": in_stock}
+    return await catalog_response("products", request, filters, cursor, limit, fields)
+
+@router.get("/products/{product_id}")
+async def get_product(product_id: str):
+    product = await repo.get_product(product_id)
+    if product is None:
+        raise HTTPException(status_code=404, detail="Mahsulot topilmadi")
+    return product
 
 @router.post("/products")
-def add_product(product: Dict):
+async def add_product(product: Dict):
     mapped_product = {
         "id": str(product.get("id")),
         "name": product.get("name"),
@@ -538,75 +199,105 @@ def add_product(product: Dict):
         "price": product.get("price", 0),
         "original_price": product.get("original_price", 0),
         "discount": product.get("discount", 0),
-        "image": product.get("image", ""),
+        "image": await run_in_threadpool(images.store_image, product.get("image", "")),
         "category_id": product.get("category_id"),
         "in_stock": product.get("inStock", True),
         "rating": product.get("rating", 0),
         "reviews_count": product.get("reviews_count", 0),
         "tannarxi": product.get("tannarxi", 0)
     }
-    products = read_json(PRODUCTS_FILE)
-    products.append(mapped_product)
-    write_json(PRODUCTS_FILE, products)
-    return mapped_product
+    result = await repo.add_product(mapped_product)
+    await catalog_snapshot("products")
+    return result
 
 @router.delete("/products/{product_id}")
-def delete_product(product_id: str):
-    products = read_json(PRODUCTS_FILE)
-    products = [p for p in products if str(p.get("id")) != str(product_id)]
-    write_json(PRODUCTS_FILE, products)
+async def delete_product(product_id: str):
+    await repo.delete_product(product_id)
+    await catalog_snapshot("products")
     return {"success": True}
 
 # --- CATEGORIES ---
 @router.get("/categories")
-def get_categories():
-    return read_json(CATEGORIES_FILE)
+async def get_categories(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+):
+    return await catalog_response("categories", request, {}, cursor, limit, fields)
 
 @router.post("/categories")
-def add_category(category: Dict):
+async def add_category(category: Dict):
     mapped_category = {
         "id": str(category.get("id")),
         "name": category.get("name", ""),
         "icon": category.get("icon", ""),
-        "image": category.get("image", ""),
+        "image": await run_in_threadpool(images.store_image, category.get("image", "")),
         "productCount": category.get("productCount", 0)
     }
-    categories = read_json(CATEGORIES_FILE)
-    categories.append(mapped_category)
-    write_json(CATEGORIES_FILE, categories)
-    return mapped_category
+    result = await repo.add_category(mapped_category)
+    await catalog_snapshot("categories")
+    return result
 
 @router.delete("/categories/{category_id}")
-def delete_category(category_id: str):
-    categories = read_json(CATEGORIES_FILE)
-    categories = [c for c in categories if str(c.get("id")) != str(category_id)]
-    write_json(CATEGORIES_FILE, categories)
+async def delete_category(category_id: str):
+    await repo.delete_category(category_id)
+    await catalog_snapshot("categories")
     return {"success": True}
 
+# --- IMAGES ---
+@router.get("/images/{name}")
+def get_image(name: str, request: Request):
+    path = images.image_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Rasm topilmadi")
+    # Rasm nomi kontent xeshi - fayl hech qachon o'zgarmaydi
+    headers = {
+        "ETag": images.image_etag(name),
+        "Cache-Control": "public, max-age=31536000, immutable",
+    }
+    if headers["ETag"] in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=images.image_media_type(name), headers=headers)
+
 # --- USERS ---
 @router.get("/users")
-def get_users():
-    return read_json(USERS_FILE)
+async def get_users(
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+):
+    return await list_response("users", {}, cursor, limit, fields)
 
 @router.post("/users")
-def add_user(user: Dict):
-    users = read_json(USERS_FILE)
-    users.append(user)
-    write_json(USERS_FILE, users)
-    return user 
+async def add_user(user: Dict):
+    return await repo.add_user(user)
 
 # --- ORDERS ---
 @router.get("/orders")
-def get_orders():
-    return read_json(ORDERS_FILE)
+async def get_orders(
+    status: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+):
+    filters = {
+        "status": status,
+        "start": parse_date_param("date_from", date_from),
+        "end": parse_date_param("date_to", date_to),
+    }
+    return await list_response("orders", filters, cursor, limit, fields)
 
 @router.post("/orders")
-def add_order(order: Dict):
-    orders = read_json(ORDERS_FILE)
-    order_id = len(orders) + 1
-    order['id'] = order_id
-    order['created_at'] = datetime.datetime.now().isoformat()
-    orders.append(order)
-    write_json(ORDERS_FILE, orders)
-    send_order_to_group(order, order_id)
-    return {"message": f"Buyurtma muvaffaqiyatli yuborildi! #{order_id}-chi buyurtma. Tez orada siz bilan bog'lanamiz."} 
\ No newline at end of file
+async def add_order(order: Dict):
+    order = await repo.add_order(normalize_order(order))
+    order_id = order['id']
+    try:
+        await run_in_threadpool(rollups.record_order, order)
+    except Exception as e:
+        print("Statistika agregatini yangilashda xatolik:", e)
+    # Telegramga yuborish fonda - mijoz javobni kutib qolmaydi
+    notifier.enqueue(send_order_to_group, order, order_id)
+    return {"message": f"Buyurtma muvaffaqiyatli yuborildi! #{order_id}-chi buyurtma. Tez orada siz bilan bog'lanamiz."}
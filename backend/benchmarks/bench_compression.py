@@ -0,0 +1,115 @@
+"""JSON javoblarini siqish: hajm va kechikish taqqoslash.
+
+    python benchmarks/bench_compression.py [so'rovlar_soni]
+
+data/*.json fayllarining har biri uchun gzip/brotli darajalari bo'yicha
+hajm, siqish/ochish vaqti va sekin (2 Mbit/s) hamda tez (20 Mbit/s)
+tarmoqda uzatish vaqti chiqariladi. Keyin eng katta fayl bitta so'rov
+orqali uch xil beriladi: siqilmagan, har so'rovda siqiladigan
+(CompressionMiddleware) va oldindan siqilgan snapshot.
+"""
+import glob
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+import compression
+from cache import dumps_bytes
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+LINKS = {"2 Mbit/s": 2_000_000 / 8, "20 Mbit/s": 20_000_000 / 8}
+
+def codecs():
+    yield "gzip-6", lambda b: gzip.compress(b, 6, mtime=0), gzip.decompress
+    yield "gzip-9", lambda b: gzip.compress(b, 9, mtime=0), gzip.decompress
+    if compression.brotli is not None:
+        brotli = compression.brotli
+        yield "br-5", lambda b: brotli.compress(b, quality=5), brotli.decompress
+        yield "br-9", lambda b: brotli.compress(b, quality=9), brotli.decompress
+    else:
+        print("brotli o'rnatilmagan - faqat gzip")
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+def compare_sizes(path):
+    with open(path, "r", encoding="utf-8") as f:
+        body = dumps_bytes(json.load(f))
+    print(f"\n{os.path.basename(path)}: {len(body) / 1024:.0f} KiB")
+    header = "".join(f"{name:>12}" for name in LINKS)
+    print(f"  {'kodlash':<10}{'KiB':>9}{'nisbat':>8}{'siqish':>10}{'ochish':>10}{header}")
+
+    def row(name, size, compress_ms, decompress_ms):
+        links = "".join(f"{size / rate * 1000:10.0f}ms" for rate in LINKS.values())
+        print(f"  {name:<10}{size / 1024:9.0f}{size / len(body):8.2f}{compress_ms:8.1f}ms{decompress_ms:8.1f}ms{links}")
+
+    row("identity", len(body), 0.0, 0.0)
+    for name, compress, decompress in codecs():
+        packed, compress_ms = timed(compress, body)
+        _, decompress_ms = timed(decompress, packed)
+        row(name, len(packed), compress_ms, decompress_ms)
+    return body
+
+def bench_app(body):
+    """Bir xil javobni uch usulda beradigan kichik ilova"""
+    snapshots = compression.CatalogSnapshots()
+    snapshots.build("bench", 1, body)
+    app = FastAPI()
+    app.add_middleware(compression.CompressionMiddleware)
+
+    @app.get("/dynamic")
+    async def dynamic():
+        return Response(content=body, media_type="application/json")
+
+    @app.get("/snapshot")
+    async def snapshot(request: Request):
+        variants = snapshots.get("bench", 1)
+        encoding = compression.choose_encoding(request.headers.get("accept-encoding"))
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding in variants and encoding is not None:
+            headers["Content-Encoding"] = encoding
+        else:
+            encoding = None
+        return Response(content=variants[encoding], media_type="application/json", headers=headers)
+
+    return app
+
+def compare_latency(body, runs):
+    encoding = compression.supported_encodings()[0]
+    client = TestClient(bench_app(body))
+    cases = (
+        ("siqilmagan", "/dynamic", "identity"),
+        (f"har so'rovda {encoding}", "/dynamic", encoding),
+        (f"snapshot {encoding}", "/snapshot", encoding),
+    )
+    print(f"\nBitta so'rov ({len(body) / 1024:.0f} KiB JSON, {runs} marta):")
+    for name, url, accept in cases:
+        client.get(url, headers={"Accept-Encoding": accept})  # isitish
+        started = time.perf_counter()
+        for _ in range(runs):
+            r = client.get(url, headers={"Accept-Encoding": accept})
+        per_request = (time.perf_counter() - started) / runs * 1000
+        wire = int(r.headers.get("content-length", len(r.content)))
+        print(f"  {name:<22} {per_request:8.2f} ms/so'rov   uzatiladi {wire / 1024:8.0f} KiB")
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    largest = b""
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "*.json"))):
+        body = compare_sizes(path)
+        if len(body) > len(largest):
+            largest = body
+    if largest:
+        compare_latency(largest, runs)
+
+if __name__ == "__main__":
+    main()
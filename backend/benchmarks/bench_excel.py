@@ -0,0 +1,103 @@
+"""Buyurtma Excel faylini yaratish: eski pandas yo'li va order_sheet.
+
+    python benchmarks/bench_excel.py [buyurtmalar_soni]
+
+Har bir usul uchun bitta buyurtmaga ketgan o'rtacha vaqt va tracemalloc
+bo'yicha eng yuqori xotira chiqariladi. pandas o'rnatilmagan bo'lsa eski
+yo'l o'tkazib yuboriladi.
+"""
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from order_sheet import order_rows, render_order_sheet
+
+def legacy_pandas_sheet(order, order_number):
+    """Avvalgi api.create_excel_order (pandas + ExcelWriter) nusxasi"""
+    import openpyxl
+    import pandas as pd
+
+    data = [
+        {'№': r[0], 'MAXSULOT NOMI': r[1], 'O\'LCHAM': r[2], 'SONI': r[3], 'NARXI': r[4], 'UMUMIY SUMMA': r[5]}
+        for r in order_rows(order)
+    ]
+    df = pd.DataFrame(data)
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='Buyurtma', index=False)
+        worksheet = writer.sheets['Buyurtma']
+        bold = openpyxl.styles.Font(bold=True)
+        for col in range(1, 7):
+            cell = worksheet.cell(row=1, column=col)
+            cell.font = bold
+            cell.fill = openpyxl.styles.PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+        for column, width in zip('ABCDEF', (8, 30, 12, 10, 15, 20)):
+            worksheet.column_dimensions[column].width = width
+        total_row = len(data) + 2
+        worksheet.cell(row=total_row, column=1, value="JAMI")
+        worksheet.cell(row=total_row, column=4, value=sum(item['SONI'] for item in data))
+        worksheet.cell(row=total_row, column=5, value=sum(item['NARXI'] for item in data))
+        worksheet.cell(row=total_row, column=6, value=sum(item['UMUMIY SUMMA'] for item in data))
+        for col in range(1, 7):
+            cell = worksheet.cell(row=total_row, column=col)
+            cell.font = bold
+            cell.fill = openpyxl.styles.PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+        info_row = total_row + 3
+        customer = order.get('customerInfo', {})
+        for offset, values in enumerate((
+            ("YUBORUVCHI:", "O'TKIRBEK", "YUBORUVCHI NOMERI:", "+998979960020"),
+            ("QABUL QILUVCHI:", customer.get('name', '-'), "Tel raqam:", customer.get('phone', '-')),
+            ("Telegram:", "@Bronavia0020", "Jami summa:", f"{order.get('total', 0)} so'm"),
+        )):
+            row = info_row + offset
+            for col, value in zip((1, 2, 4, 5), values):
+                worksheet.cell(row=row, column=col, value=value)
+            for col in (1, 4):
+                cell = worksheet.cell(row=row, column=col)
+                cell.font = bold
+                cell.fill = openpyxl.styles.PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid")
+    output.seek(0)
+    return output
+
+def sample_order(items=5):
+    return {
+        'items': [
+            {'product_id': str(i), 'name': f"Mahsulot {i}", 'price': 10000 + i, 'quantity': i % 3 + 1}
+            for i in range(items)
+        ],
+        'total': 0,
+        'customerInfo': {'name': 'Test', 'phone': '+998901234567'},
+    }
+
+def measure(name, func, order, runs):
+    func(order, 1)  # isitish (importlar va keshlar)
+    started = time.perf_counter()
+    for i in range(runs):
+        func(order, i)
+    per_order = (time.perf_counter() - started) / runs * 1000
+
+    tracemalloc.start()
+    func(order, 1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<14} {per_order:8.2f} ms/buyurtma   peak {peak / 1024:8.1f} KiB")
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    order = sample_order()
+
+    started = time.perf_counter()
+    try:
+        import pandas  # noqa: F401
+        print(f"pandas import: {(time.perf_counter() - started) * 1000:.0f} ms")
+        measure("pandas", legacy_pandas_sheet, order, runs)
+    except ImportError:
+        print("pandas o'rnatilmagan - eski yo'l o'tkazib yuborildi")
+    measure("order_sheet", render_order_sheet, order, runs)
+
+if __name__ == "__main__":
+    main()
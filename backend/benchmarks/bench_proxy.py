@@ -0,0 +1,157 @@
+"""proxy.py yuklama testi: eski (har so'rovga yangi klient, buferlash) va
+yangi (umumiy pool, oqim) proksi.
+
+    python benchmarks/bench_proxy.py [so'rovlar_soni] [parallel]
+
+Mahalliy stub upstream va ikkala proksi alohida jarayonlarda ishga
+tushiriladi. Kichik (1 KiB) va katta (8 MiB) javoblar uchun kechikish
+p50/p95, o'tkazuvchanlik va proksi jarayonining eng yuqori RSS (VmHWM)
+chiqariladi.
+"""
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+
+UPSTREAM_PORT = 18601
+PROXY_PORT = 18602
+LARGE_SIZE = 8 * 1024 * 1024
+CHUNK = 64 * 1024
+
+def upstream_app():
+    from fastapi import FastAPI, Request
+    from fastapi.responses import Response, StreamingResponse
+
+    app = FastAPI()
+    small = b"x" * 1024
+
+    @app.get("/small")
+    async def get_small():
+        return Response(content=small, media_type="text/plain")
+
+    @app.get("/large")
+    async def get_large():
+        async def chunks():
+            for _ in range(LARGE_SIZE // CHUNK):
+                yield b"y" * CHUNK
+        return StreamingResponse(chunks(), media_type="application/octet-stream",
+                                 headers={"Content-Length": str(LARGE_SIZE)})
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.body()
+        return {"received": len(body), "user_agent": request.headers.get("user-agent")}
+
+    return app
+
+def legacy_app(target):
+    """Avvalgi proxy.py (har so'rovda yangi AsyncClient, faqat GET) nusxasi"""
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+
+    app = FastAPI()
+
+    @app.get("/{path:path}")
+    async def proxy(path: str):
+        async with httpx.AsyncClient() as client:
+            headers = {"ngrok-skip-browser-warning": "true", "User-Agent": "TelegramWebApp"}
+            response = await client.get(f"{target}/{path}", headers=headers)
+            return StreamingResponse(
+                response.iter_bytes(),
+                status_code=response.status_code,
+                headers=dict(response.headers),
+            )
+
+    return app
+
+def serve(kind, port):
+    import uvicorn
+
+    target = f"http://127.0.0.1:{UPSTREAM_PORT}"
+    if kind == "upstream":
+        app = upstream_app()
+    elif kind == "legacy":
+        app = legacy_app(target)
+    else:
+        os.environ["PROXY_TARGET"] = target
+        from proxy import app
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+def start(kind, port):
+    process = subprocess.Popen([sys.executable, __file__, "serve", kind, str(port)], cwd=BACKEND_DIR)
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/small", timeout=1.0)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{kind} ishga tushmadi")
+
+def peak_rss_kib(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    return 0
+
+async def load(url, requests, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60.0) as client:
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                async with client.stream("GET", url) as r:
+                    async for _ in r.aiter_raw():
+                        pass
+                    r.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return statistics.median(latencies), p95, requests / elapsed
+
+async def check_post():
+    async with httpx.AsyncClient() as client:
+        r = await client.post(f"http://127.0.0.1:{PROXY_PORT}/echo", content=b"z" * 100000)
+        print(f"  POST /echo: {r.status_code} {r.json()}")
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    upstream = start("upstream", UPSTREAM_PORT)
+    try:
+        for kind in ("legacy", "pooled"):
+            proxy = start(kind, PROXY_PORT)
+            try:
+                print(f"\n{kind}:")
+                for path, count in (("small", requests), ("large", max(requests // 10, concurrency))):
+                    p50, p95, rps = asyncio.run(load(f"http://127.0.0.1:{PROXY_PORT}/{path}", count, concurrency))
+                    print(f"  /{path:<6} {count:5d} so'rov  p50 {p50:8.1f} ms  p95 {p95:8.1f} ms  {rps:8.1f} so'rov/s")
+                if kind == "pooled":
+                    asyncio.run(check_post())
+                print(f"  proksi peak RSS: {peak_rss_kib(proxy.pid) / 1024:.1f} MiB")
+            finally:
+                proxy.terminate()
+                proxy.wait()
+    finally:
+        upstream.terminate()
+        upstream.wait()
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,121 @@
+"""Webhook rejimi uchun soxta Telegram: update larni POST qiladi.
+
+    python benchmarks/bench_webhook.py [update_soni] [parallel]
+
+telegram_stub.py (Bot API) va run.py (BOT_MODE=webhook) alohida
+jarayonlarda ishga tushiriladi. Harness Telegram o'rniga /start
+update larini secret token bilan webhookka yuboradi (har 10-chisi
+takroriy update_id). Webhook javob kechikishi p50/p95, qabul qilish
+tezligi va barcha javob xabarlari stubga yetib borguncha ketgan vaqt
+(end-to-end o'tkazuvchanlik) chiqariladi.
+"""
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+STUB_PORT = 18801
+API_PORT = 18802
+SECRET = "bench-secret"
+WEBHOOK_PATH = "/telegram/webhook"
+
+def start(args, port, env, probe):
+    process = subprocess.Popen(args, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(150):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}{probe}", timeout=1.0)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{args} ishga tushmadi")
+
+def make_update(update_id):
+    user = {"id": 100000 + update_id % 50, "is_bot": False, "first_name": f"Mijoz {update_id % 50}"}
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user["id"], "type": "private"},
+            "from": user,
+            "text": "/start",
+            "entities": [{"type": "bot_command", "offset": 0, "length": 6}],
+        },
+    }
+
+async def post_updates(count, concurrency):
+    url = f"http://127.0.0.1:{API_PORT}{WEBHOOK_PATH}"
+    # Har 10-chi update oldingisining takrori (Telegram qayta yuborishi)
+    update_ids = [i - 1 if i % 10 == 0 else i for i in range(1, count + 1)]
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(headers={"X-Telegram-Bot-Api-Secret-Token": SECRET}) as client:
+        r = await client.post(url, json=make_update(0), headers={"X-Telegram-Bot-Api-Secret-Token": "wrong"})
+        print(f"noto'g'ri secret: {r.status_code}")
+
+        async def one(update_id):
+            async with semaphore:
+                started = time.perf_counter()
+                r = await client.post(url, json=make_update(update_id))
+                r.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(update_id) for update_id in update_ids))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return len(set(update_ids)), elapsed, latencies
+
+def wait_for_replies(expected, timeout=120.0):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        sent = httpx.get(f"http://127.0.0.1:{STUB_PORT}/calls").json()["methods"].get("sendMessage", 0)
+        if sent >= expected:
+            return sent
+        time.sleep(0.05)
+    return sent
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    env = dict(
+        os.environ,
+        BOT_MODE="webhook",
+        BOT_TOKEN="123456:BENCH",
+        WEBHOOK_SECRET=SECRET,
+        WEBHOOK_URL=f"http://127.0.0.1:{API_PORT}",
+        WEBAPP_URL="https://example.com",
+        TELEGRAM_API_URL=f"http://127.0.0.1:{STUB_PORT}",
+        API_PORT=str(API_PORT),
+    )
+    stub = start([sys.executable, "-m", "uvicorn", "telegram_stub:app", "--port", str(STUB_PORT), "--log-level", "warning"],
+                 STUB_PORT, env, "/calls")
+    try:
+        api = start([sys.executable, "run.py"], API_PORT, env, "/api/users?limit=1")
+        try:
+            httpx.delete(f"http://127.0.0.1:{STUB_PORT}/calls")
+            started = time.perf_counter()
+            unique, elapsed, latencies = asyncio.run(post_updates(count, concurrency))
+            sent = wait_for_replies(unique)
+            total = time.perf_counter() - started
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(f"{count} update ({unique} ta noyob), {concurrency} parallel")
+            print(f"  webhook javobi: p50 {statistics.median(latencies):.1f} ms  p95 {p95:.1f} ms  {count / elapsed:.0f} update/s")
+            print(f"  end-to-end: {sent} sendMessage, {total:.2f} s, {sent / total:.0f} javob/s")
+        finally:
+            api.terminate()
+            api.wait()
+    finally:
+        stub.terminate()
+        stub.wait()
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import os
 from aiogram import Bot, Dispatcher, types
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.enums import ParseMode
 from aiogram.filters import CommandStart, Command
 from aiogram.types import Message, WebAppInfo, InlineKeyboardMarkup, InlineKeyboardButton
@@ -7,6 +9,9 @@ from aiogram.utils.markdown import hbold
 from dotenv import load_dotenv
 import asyncio
 
+from handlers.admin import admin_router
+from handlers.user import user_router
+
 load_dotenv()
 TOKEN = os.getenv("BOT_TOKEN")
 WEBAPP_URL = os.getenv("WEBAPP_URL")
@@ -19,8 +24,14 @@ else:
     print("ERROR: GROUP_CHAT_ID not found in .env file")
     GROUP_CHAT_ID = None
 
-bot = Bot(TOKEN, parse_mode=ParseMode.HTML)
+# Testlarda telegram_stub.py ga yo'naltirish uchun
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL")
+session = AiohttpSession(api=TelegramAPIServer.from_base(TELEGRAM_API_URL)) if TELEGRAM_API_URL else None
+
+bot = Bot(TOKEN, session=session, parse_mode=ParseMode.HTML)
 dp = Dispatcher()
+dp.include_router(user_router)
+dp.include_router(admin_router)
 
 def order_text(order_data: dict) -> str:
     text = (
@@ -79,8 +90,10 @@ async def test_order(message: Message):
     await send_order_to_group(order_data)
     await message.answer("Buyurtma xabari guruhga yuborildi!")
 
-async def main():
-    await dp.start_polling(bot)
+async def main(handle_signals=True):
+    # Webhook rejimida update lar main.py (webhook.py) orqali keladi
+    await bot.delete_webhook()
+    await dp.start_polling(bot, handle_signals=handle_signals)
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
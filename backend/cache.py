@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import threading
+
+class _Entry:
+    __slots__ = ("key", "data", "body", "digest")
+
+    def __init__(self, key, data, body=None):
+        self.key = key
+        self.data = data
+        self.body = body
+        self.digest = None
+
+def _file_key(file_path):
+    """Fayl holati kaliti: (mtime_ns, size). Fayl yo'q bo'lsa None"""
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def dumps_bytes(data):
+    """HTTP javob uchun ixcham JSON baytlari"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class JsonFileCache:
+    """JSON fayllar uchun jarayon darajasidagi write-through kesh.
+
+    Har bir fayl bir marta o'qiladi va parse qilinadi; fayl mtime yoki
+    hajmi o'zgarsa (masalan boshqa worker yozgan bo'lsa) qayta o'qiladi.
+    Yozishda kesh joyida yangilanadi. Javob uchun JSON baytlari ham
+    saqlanadi, shuning uchun GET so'rovlar qayta encode qilmaydi.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, file_path):
+        key = _file_key(file_path)
+        entry = self._entries.get(file_path)
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and entry.key == key:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            if key is None:
+                entry = _Entry(None, [])
+            else:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # O'qish vaqtida fayl o'zgargan bo'lishi mumkin
+                entry = _Entry(_file_key(file_path), data)
+            self._entries[file_path] = entry
+            return entry
+
+    def read(self, file_path):
+        data = self._load(file_path).data
+        # Chaqiruvchi ro'yxatni o'zgartirsa ham kesh buzilmasligi uchun
+        return list(data) if isinstance(data, list) else data
+
+    def read_bytes(self, file_path):
+        entry = self._load(file_path)
+        if entry.body is None:
+            entry.body = dumps_bytes(entry.data)
+        return entry.body
+
+    def version(self, file_path):
+        """Fayl kontenti xeshi va o'zgargan vaqti (ETag/Last-Modified uchun)"""
+        entry = self._load(file_path)
+        if entry.digest is None:
+            if entry.body is None:
+                entry.body = dumps_bytes(entry.data)
+            entry.digest = hashlib.sha256(entry.body).hexdigest()[:32]
+        modified = entry.key[0] / 1e9 if entry.key else 0.0
+        return entry.digest, modified
+
+    def write(self, file_path, data):
+        with self._lock:
+            tmp_path = f"{file_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, file_path)
+            self._entries[file_path] = _Entry(_file_key(file_path), data)
+
+    def invalidate(self, file_path=None):
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(file_path, None)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "files": len(self._entries),
+        }
+
+json_cache = JsonFileCache()
@@ -0,0 +1,175 @@
+import gzip
+import threading
+
+try:
+    import brotli
+except ImportError:  # brotli ixtiyoriy - bo'lmasa faqat gzip
+    brotli = None
+
+# Bundan kichik javoblarni siqish foyda bermaydi
+MIN_SIZE = 500
+# Har so'rovda siqiladigan javoblar uchun tez darajalar
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Katalog snapshotlari versiyaga bir marta siqiladi. brotli 10-11 katta
+# katalogda soniyalab vaqt oladi, hajm esa 9 dan deyarli kichraymaydi.
+SNAPSHOT_GZIP_LEVEL = 9
+SNAPSHOT_BROTLI_QUALITY = 9
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+def supported_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def choose_encoding(accept_encoding):
+    """Accept-Encoding dan eng yaxshi kodlash ("br", "gzip" yoki None)"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    for encoding in supported_encodings():
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > 0:
+            return encoding
+    return None
+
+def compress(body, encoding, snapshot=False):
+    if encoding == "br":
+        return brotli.compress(body, quality=SNAPSHOT_BROTLI_QUALITY if snapshot else BROTLI_QUALITY)
+    if encoding == "gzip":
+        # mtime=0 - bir xil kontent uchun bir xil baytlar
+        return gzip.compress(body, compresslevel=SNAPSHOT_GZIP_LEVEL if snapshot else GZIP_LEVEL, mtime=0)
+    return body
+
+def weak_etag(etag):
+    """Siqilgan javob boshqa baytlar - kuchli ETag kuchsizga aylanadi"""
+    if etag is None or etag.startswith("W/"):
+        return etag
+    return "W/" + etag
+
+class CatalogSnapshots:
+    """Katalog ro'yxatlarining oldindan siqilgan nusxalari.
+
+    Har bir tur (products, categories) uchun oxirgi versiyadagi javob
+    baytlari barcha qo'llab-quvvatlanadigan kodlashlarda saqlanadi.
+    Versiya o'zgarganda (katalogga yozilganda) bir marta qayta quriladi;
+    GET so'rovlar tayyor baytlarni qaytaradi.
+    """
+
+    def __init__(self):
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, kind, version):
+        snapshot = self._snapshots.get(kind)
+        if snapshot is not None and snapshot[0] == version:
+            return snapshot[1]
+        return None
+
+    def build(self, kind, version, body):
+        """Versiya uchun barcha kodlashlarni tayyorlaydi (threadpool da chaqiriladi)"""
+        with self._lock:
+            existing = self.get(kind, version)
+            if existing is not None:
+                return existing
+            variants = {None: body}
+            if len(body) >= MIN_SIZE:
+                for encoding in supported_encodings():
+                    variants[encoding] = compress(body, encoding, snapshot=True)
+            self._snapshots[kind] = (version, variants)
+            self.builds += 1
+            return variants
+
+    def sizes(self, kind):
+        snapshot = self._snapshots.get(kind)
+        if snapshot is None:
+            return {}
+        return {encoding or "identity": len(body) for encoding, body in snapshot[1].items()}
+
+catalog_snapshots = CatalogSnapshots()
+
+def _header(headers, name):
+    name = name.encode("latin-1")
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+class CompressionMiddleware:
+    """JSON/matn javoblarni Accept-Encoding bo'yicha br yoki gzip bilan siqadi.
+
+    Content-Encoding allaqachon qo'yilgan javoblar (masalan katalog
+    snapshotlari) va rasm kabi siqilmaydigan turlar o'zgarishsiz o'tadi.
+    """
+
+    def __init__(self, app, minimum_size=MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        chunks = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                response_headers = message.get("headers", [])
+                content_type = _header(response_headers, "content-type") or ""
+                if (
+                    _header(response_headers, "content-encoding") is not None
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            response_headers = [
+                (key, value) for key, value in start_message.get("headers", [])
+                if key.lower() not in (b"content-length", b"etag", b"vary")
+            ]
+            etag = _header(start_message.get("headers", []), "etag")
+            vary = _header(start_message.get("headers", []), "vary")
+            if len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                response_headers.append((b"content-encoding", encoding.encode()))
+                etag = weak_etag(etag)
+            if etag is not None:
+                response_headers.append((b"etag", etag.encode("latin-1")))
+            if not vary:
+                vary = "Accept-Encoding"
+            elif "accept-encoding" not in vary.lower():
+                vary += ", Accept-Encoding"
+            response_headers.append((b"vary", vary.encode("latin-1")))
+            response_headers.append((b"content-length", str(len(body)).encode()))
+            await send({**start_message, "headers": response_headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import update, create_engine, Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
@@ -36,7 +36,9 @@ class Category(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(100), unique=True)
     description = Column(Text)
+    icon = Column(String(255))
     image = Column(String(255))
+    product_count = Column(Integer, default=0)
     parent_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -53,10 +55,11 @@ class Product(Base):
     original_price = Column(Float)
     discount = Column(Integer)
     image = Column(String(255))
-    category_id = Column(Integer, ForeignKey("categories.id"))
+    category_id = Column(Integer, ForeignKey("categories.id"), index=True)
     in_stock = Column(Boolean, default=True)
     rating = Column(Float, default=0)
     reviews_count = Column(Integer, default=0)
+    tannarxi = Column(Float, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     category = relationship("Category", back_populates="products")
@@ -67,12 +70,13 @@ class Order(Base):
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    status = Column(String(50), default="pending")  # pending, confirmed, delivered, cancelled
+    status = Column(String(50), default="pending", index=True)  # pending, confirmed, delivered, cancelled
     total_amount = Column(Float)
+    customer_name = Column(String(100))
     address = Column(Text)
     location = Column(String(100))  # Coordinates
     phone = Column(String(20))
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     
     user = relationship("User", back_populates="orders")
     items = relationship("OrderItem", back_populates="order")
@@ -83,12 +87,31 @@ class OrderItem(Base):
     id = Column(Integer, primary_key=True)
     order_id = Column(Integer, ForeignKey("orders.id"))
     product_id = Column(Integer, ForeignKey("products.id"))
+    name = Column(String(200))
     quantity = Column(Integer)
     price = Column(Float)
     
     order = relationship("Order", back_populates="items")
     product = relationship("Product", back_populates="order_items")
 
+class CatalogState(Base):
+    """Generation counter per catalog kind, bumped on every catalog write"""
+    __tablename__ = "catalog_state"
+
+    kind = Column(String(50), primary_key=True)  # products, categories
+    generation = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+async def bump_catalog(session, kind):
+    """Increment the catalog generation inside the caller's transaction"""
+    result = await session.execute(
+        update(CatalogState)
+        .where(CatalogState.kind == kind)
+        .values(generation=CatalogState.generation + 1, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        session.add(CatalogState(kind=kind, generation=1, updated_at=datetime.utcnow()))
+
 # Create tables
 async def init_db():
     async with engine.begin() as conn:
@@ -0,0 +1,95 @@
+import mimetypes
+import os
+
+from fastapi.responses import FileResponse, Response
+
+from compression import choose_encoding, compress, supported_encodings
+
+# Vite build natijasi (npm run build)
+FRONTEND_DIST = os.getenv(
+    "FRONTEND_DIST",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend", "dist"),
+)
+# Vite assets/ ichidagi fayl nomlariga kontent xeshini qo'shadi - ular o'zgarmaydi
+HASHED_ASSETS_DIR = "assets"
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# index.html va boshqa xeshsiz fayllar har safar tekshiriladi
+REVALIDATE_CACHE = "no-cache"
+PRECOMPRESS_EXTENSIONS = (".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".map", ".webmanifest")
+SIBLING_EXTENSIONS = {"br": ".br", "gzip": ".gz"}
+
+def resolve(dist, path):
+    """URL yo'lini dist ichidagi faylga aylantiradi; tashqariga chiqsa None"""
+    root = os.path.realpath(dist)
+    full_path = os.path.realpath(os.path.join(root, path.lstrip("/")))
+    if full_path != root and not full_path.startswith(root + os.sep):
+        return None
+    return full_path
+
+def _stat_file(path):
+    try:
+        stat_result = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat_result if os.path.isfile(path) else None
+
+def serve_static(dist, path, request):
+    """Build qilingan WebApp faylini beradi.
+
+    Xeshli assetlar immutable kesh bilan, qolganlari no-cache bilan
+    beriladi. Yonida .br/.gz nusxasi bo'lsa va mijoz qabul qilsa, o'sha
+    beriladi. Topilmagan sahifa yo'llari index.html ga tushadi (SPA
+    router), topilmagan assetlar esa 404.
+    """
+    full_path = resolve(dist, path)
+    stat_result = _stat_file(full_path) if full_path else None
+    if stat_result is None:
+        if path.startswith(HASHED_ASSETS_DIR + "/") or os.path.splitext(path)[1] not in ("", ".html"):
+            return Response(status_code=404)
+        path = "index.html"
+        full_path = os.path.join(dist, path)
+        stat_result = _stat_file(full_path)
+        if stat_result is None:
+            return Response(status_code=404, content=b"frontend/dist topilmadi - npm run build")
+
+    media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    headers = {
+        "Cache-Control": IMMUTABLE_CACHE if path.startswith(HASHED_ASSETS_DIR + "/") else REVALIDATE_CACHE,
+        "Vary": "Accept-Encoding",
+    }
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding is not None:
+        sibling_path = full_path + SIBLING_EXTENSIONS[encoding]
+        sibling_stat = _stat_file(sibling_path)
+        if sibling_stat is not None:
+            full_path, stat_result = sibling_path, sibling_stat
+            headers["Content-Encoding"] = encoding
+
+    response = FileResponse(full_path, headers=headers, media_type=media_type, stat_result=stat_result)
+    if response.headers["etag"] in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={
+            key: response.headers[key] for key in ("etag", "cache-control", "vary", "last-modified")
+        })
+    return response
+
+def precompress(dist=FRONTEND_DIST):
+    """dist ichidagi matn fayllar yoniga .br va .gz nusxalarini yozadi"""
+    count = 0
+    for root, _, files in os.walk(dist):
+        for name in files:
+            if not name.endswith(PRECOMPRESS_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                body = f.read()
+            for encoding in supported_encodings():
+                packed = compress(body, encoding, snapshot=True)
+                # Siqilgani kattaroq bo'lsa nusxa kerak emas
+                if len(packed) < len(body):
+                    with open(path + SIBLING_EXTENSIONS[encoding], "wb") as f:
+                        f.write(packed)
+                    count += 1
+    return count
+
+if __name__ == "__main__":
+    print(f"{precompress()} ta siqilgan nusxa yozildi: {FRONTEND_DIST}")
@@ -0,0 +1,107 @@
+import base64
+import binascii
+import hashlib
+import os
+import re
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+IMAGES_DIR = os.path.join(DATA_DIR, "images")
+IMAGES_URL_PREFIX = "/api/images/"
+
+DATA_URL_RE = re.compile(r"^data:(image/[a-zA-Z0-9.+-]+);base64,(.*)$", re.DOTALL)
+IMAGE_NAME_RE = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]+$")
+
+MIME_TO_EXT = {
+    "image/jpeg": "jpg",
+    "image/jpg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+    "image/svg+xml": "svg",
+    "image/avif": "avif",
+}
+EXT_TO_MIME = {
+    "jpg": "image/jpeg",
+    "png": "image/png",
+    "webp": "image/webp",
+    "gif": "image/gif",
+    "svg": "image/svg+xml",
+    "avif": "image/avif",
+}
+
+def is_data_url(value):
+    return isinstance(value, str) and value.startswith("data:image/")
+
+def store_image(value):
+    """base64 rasmni faylga saqlab, qisqa URL qaytaradi.
+
+    Fayl nomi kontent sha256 xeshidan olinadi, shuning uchun bir xil rasm
+    faqat bir marta saqlanadi. data: URL bo'lmagan qiymatlar o'zgarmaydi.
+    """
+    if not is_data_url(value):
+        return value
+    match = DATA_URL_RE.match(value)
+    if not match:
+        return value
+    mime, payload = match.groups()
+    ext = MIME_TO_EXT.get(mime.lower())
+    if ext is None:
+        return value
+    try:
+        raw = base64.b64decode(payload, validate=False)
+    except (binascii.Error, ValueError):
+        return value
+
+    digest = hashlib.sha256(raw).hexdigest()
+    name = f"{digest}.{ext}"
+    path = os.path.join(IMAGES_DIR, name)
+    if not os.path.exists(path):
+        os.makedirs(IMAGES_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+        os.replace(tmp_path, path)
+    return IMAGES_URL_PREFIX + name
+
+def image_path(name):
+    """Rasm nomi bo'yicha fayl yo'li (noto'g'ri nom bo'lsa None)"""
+    if not IMAGE_NAME_RE.match(name):
+        return None
+    path = os.path.join(IMAGES_DIR, name)
+    if not os.path.isfile(path):
+        return None
+    return path
+
+def image_media_type(name):
+    return EXT_TO_MIME.get(name.rsplit(".", 1)[-1], "application/octet-stream")
+
+def image_etag(name):
+    # Nomning o'zi kontent xeshi, ETag uchun qayta hisoblash shart emas
+    return f'"{name.split(".", 1)[0]}"'
+
+def migrate_json_images(file_paths):
+    """Mavjud JSON fayllardagi base64 rasmlarni rasm omboriga ko'chiradi"""
+    import json
+
+    for file_path in file_paths:
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        changed = 0
+        for record in records:
+            if isinstance(record, dict) and is_data_url(record.get("image")):
+                record["image"] = store_image(record["image"])
+                changed += 1
+        if changed:
+            tmp_path = f"{file_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(records, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, file_path)
+        print(f"{os.path.basename(file_path)}: {changed} ta rasm ko'chirildi")
+
+if __name__ == "__main__":
+    migrate_json_images([
+        os.path.join(DATA_DIR, "products.json"),
+        os.path.join(DATA_DIR, "categories.json"),
+    ])
@@ -1,9 +1,36 @@
+import os
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api import router
+from api import catalog_snapshot, router, repo
+from compression import CompressionMiddleware
+from notifications import notifier
+from scheduler import scheduler
+
+# polling - bot run.py/bot.py da getUpdates bilan ishlaydi;
+# webhook - update lar shu ilovaning WEBHOOK_PATH manziliga keladi
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await repo.startup()
+    # Katalog snapshotlari birinchi so'rovdan oldin siqib qo'yiladi
+    await catalog_snapshot("products")
+    await catalog_snapshot("categories")
+    await notifier.start()
+    # Cron ishlari faqat leader workerda ishlaydi
+    await scheduler.start()
+    if BOT_MODE == "webhook":
+        await webhook.setup_webhook()
+    yield
+    if BOT_MODE == "webhook":
+        await webhook.shutdown_webhook()
+    await scheduler.stop()
+    await notifier.stop()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS middleware qo'shish
 app.add_middleware(
@@ -14,8 +41,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# JSON javoblarni siqish (katalog snapshotlari allaqachon siqilgan)
+app.add_middleware(CompressionMiddleware)
+
 # Router ni qo'shish
 app.include_router(router, prefix="/api")
 
+if BOT_MODE == "webhook":
+    import webhook
+
+    app.include_router(webhook.router)
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8001) 
@@ -0,0 +1,141 @@
+import asyncio
+import os
+from io import BytesIO
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+BOT_TOKEN = os.getenv("BOT_TOKEN")
+GROUP_CHAT_ID_STR = os.getenv("GROUP_CHAT_ID")
+
+# Xavfsiz int ga o'tkazish
+if GROUP_CHAT_ID_STR:
+    GROUP_CHAT_ID = int(GROUP_CHAT_ID_STR)
+else:
+    print("ERROR: GROUP_CHAT_ID not found in .env file")
+    GROUP_CHAT_ID = None
+
+# Testlarda telegram_stub.py ga yo'naltirish uchun
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org").rstrip("/")
+
+MAX_ATTEMPTS = 5
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+QUEUE_SIZE = 1000
+
+class TelegramError(Exception):
+    pass
+
+class TelegramNotifier:
+    """Telegramga xabarlarni fon navbati orqali yuboradi.
+
+    So'rov handlerlari faqat ishni navbatga qo'yadi va darhol javob
+    qaytaradi; yuborish bitta umumiy (connection pool) httpx klient
+    orqali, xatolarda qayta urinish va kutish (backoff) bilan bajariladi.
+    """
+
+    def __init__(self, token=BOT_TOKEN, api_url=TELEGRAM_API_URL, workers=1):
+        self.token = token
+        self.api_url = api_url
+        self.workers = workers
+        self.queue = None
+        self.client = None
+        self.loop = None
+        self._tasks = []
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+
+    async def start(self):
+        if self.client is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+        )
+        # Bir worker - guruhdagi xabarlar tartibi saqlanadi
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout=10.0):
+        """Navbatdagi ishlarni tugatishga urinadi, keyin to'xtatadi"""
+        if self.client is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"ERROR: notification navbatida {self.queue.qsize()} ta ish qoldi")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.client.aclose()
+        self.client = None
+
+    def enqueue(self, func, *args):
+        """Korutina funksiyasini fon navbatiga qo'yadi"""
+        if self.queue is None:
+            raise RuntimeError("TelegramNotifier ishga tushirilmagan")
+        try:
+            self.queue.put_nowait((func, args))
+        except asyncio.QueueFull:
+            self.failed += 1
+            print(f"ERROR: notification navbati to'la, {func.__name__} tashlab yuborildi")
+
+    def enqueue_threadsafe(self, func, *args):
+        """enqueue ning boshqa threaddan (masalan scheduler) chaqiriladigan varianti"""
+        if self.loop is None:
+            raise RuntimeError("TelegramNotifier ishga tushirilmagan")
+        self.loop.call_soon_threadsafe(self.enqueue, func, *args)
+
+    async def send_message(self, text, chat_id=GROUP_CHAT_ID, **params):
+        return await self.call("sendMessage", json={"chat_id": chat_id, "text": text, **params})
+
+    async def send_document(self, filename, content, caption="", chat_id=GROUP_CHAT_ID):
+        files = {"document": (filename, BytesIO(content))}
+        return await self.call("sendDocument", data={"chat_id": chat_id, "caption": caption}, files=files)
+
+    async def _worker(self):
+        while True:
+            func, args = await self.queue.get()
+            try:
+                await func(*args)
+            except Exception as e:
+                self.failed += 1
+                print(f"ERROR: {func.__name__} bajarilmadi: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def call(self, method, json=None, data=None, files=None):
+        """Bot API metodini chaqiradi (429/5xx va tarmoq xatolarida qayta urinadi)"""
+        if not self.token:
+            raise TelegramError("BOT_TOKEN is not set")
+        url = f"{self.api_url}/bot{self.token}/{method}"
+        delay = BASE_DELAY
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            retry_after = None
+            try:
+                if files:
+                    # Fayl obyektlari har urinishda boshidan o'qilishi kerak
+                    for value in files.values():
+                        value[1].seek(0)
+                r = await self.client.post(url, json=json, data=data, files=files)
+                if r.status_code == 200:
+                    self.sent += 1
+                    return r.json()
+                if r.status_code != 429 and r.status_code < 500:
+                    raise TelegramError(f"{method}: {r.status_code} {r.text}")
+                if r.status_code == 429:
+                    retry_after = r.json().get("parameters", {}).get("retry_after")
+                error = f"{r.status_code} {r.text}"
+            except httpx.TransportError as e:
+                error = repr(e)
+            if attempt == MAX_ATTEMPTS:
+                raise TelegramError(f"{method}: {MAX_ATTEMPTS} urinishdan keyin ham xato: {error}")
+            self.retried += 1
+            await asyncio.sleep(retry_after or delay)
+            delay = min(delay * 2, MAX_DELAY)
+
+notifier = TelegramNotifier()
@@ -0,0 +1,72 @@
+from io import BytesIO
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+
+HEADERS = ['№', 'MAXSULOT NOMI', 'O\'LCHAM', 'SONI', 'NARXI', 'UMUMIY SUMMA']
+COLUMN_WIDTHS = {'A': 8, 'B': 30, 'C': 12, 'D': 10, 'E': 15, 'F': 20}
+
+BOLD = Font(bold=True)
+HEADER_FILL = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+TOTAL_FILL = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+LABEL_FILL = PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid")
+
+def order_rows(order):
+    """Buyurtma elementlaridan jadval qatorlari"""
+    rows = []
+    for i, item in enumerate(order.get('items', []), 1):
+        quantity = item.get('quantity', 1)
+        price = item.get('price') or item.get('product', {}).get('price') or 0
+        rows.append([i, item.get('name', ''), 'DONA', quantity, price, int(price) * int(quantity)])
+    return rows
+
+def _styled_row(ws, values, fill, styled_columns=None):
+    row = []
+    for col, value in enumerate(values, 1):
+        cell = WriteOnlyCell(ws, value=value)
+        if styled_columns is None or col in styled_columns:
+            cell.font = BOLD
+            cell.fill = fill
+        row.append(cell)
+    return row
+
+def render_order_sheet(order, order_number):
+    """Buyurtma Excel faylini yaratadi (pandas siz, openpyxl write-only rejimi).
+
+    Natija avvalgi create_excel_order bilan bir xil ko'rinishda: qalin
+    sarlavhalar, JAMI qatori va yuboruvchi/qabul qiluvchi bloki.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Buyurtma')
+    for column, width in COLUMN_WIDTHS.items():
+        ws.column_dimensions[column].width = width
+
+    rows = order_rows(order)
+    ws.append(_styled_row(ws, HEADERS, HEADER_FILL))
+    for row in rows:
+        ws.append(row)
+
+    # Jami qatori
+    ws.append(_styled_row(ws, [
+        "JAMI", None, None,
+        sum(row[3] for row in rows),
+        sum(row[4] for row in rows),
+        sum(row[5] for row in rows),
+    ], TOTAL_FILL))
+    ws.append([])
+    ws.append([])
+
+    customer = order.get('customerInfo', {})
+    info_rows = [
+        ["YUBORUVCHI:", "O'TKIRBEK", None, "YUBORUVCHI NOMERI:", "+998979960020"],
+        ["QABUL QILUVCHI:", customer.get('name', '-'), None, "Tel raqam:", customer.get('phone', '-')],
+        ["Telegram:", "@Bronavia0020", None, "Jami summa:", f"{order.get('total', 0)} so'm"],
+    ]
+    for values in info_rows:
+        ws.append(_styled_row(ws, values, LABEL_FILL, styled_columns=(1, 4)))
+
+    output = BytesIO()
+    wb.save(output)
+    output.seek(0)
+    return output
@@ -0,0 +1,202 @@
+import datetime
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from cache import dumps_bytes, json_cache
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+ORDERS_FILE = os.path.join(DATA_DIR, "orders.json")
+ORDERS_LOG_FILE = os.path.join(DATA_DIR, "orders.jsonl")
+ORDERS_SEQ_FILE = os.path.join(DATA_DIR, "orders.seq")
+ORDERS_LOCK_FILE = os.path.join(DATA_DIR, "orders.lock")
+
+def _to_int(value, default=0):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+def order_created_at(order):
+    """Buyurtma vaqti (mahalliy, tz siz). Eski buyurtmalarda faqat mijoz
+    yuborgan createdAt (UTC) bor - u mahalliy vaqtga o'tkaziladi."""
+    try:
+        if order.get("created_at"):
+            return datetime.datetime.fromisoformat(order["created_at"])
+        if order.get("createdAt"):
+            created = datetime.datetime.fromisoformat(order["createdAt"].replace("Z", "+00:00"))
+            return created.astimezone().replace(tzinfo=None)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+def normalize_order_item(item):
+    """Buyurtma elementidan faqat kerakli maydonlarni qoldiradi.
+
+    Mijoz savatdagi butun mahsulot obyektini (rasm bilan birga) yuboradi,
+    bizga esa faqat mahsulot id, nomi, narxi va soni kerak.
+    """
+    product = item.get("product") or {}
+    return {
+        "product_id": str(item.get("product_id") or product.get("id") or item.get("id") or ""),
+        "name": item.get("name") or product.get("name") or "",
+        "price": _to_int(item.get("price") or product.get("price") or 0),
+        "quantity": _to_int(item.get("quantity", 1), 1),
+    }
+
+def normalize_order(order):
+    """Buyurtmani saqlash uchun tayyorlaydi (elementlar normallashtiriladi)"""
+    normalized = dict(order)
+    normalized["items"] = [normalize_order_item(item) for item in order.get("items", [])]
+    return normalized
+
+@contextmanager
+def orders_lock():
+    """Jarayonlar va threadlar orasidagi eksklyuziv fayl qulfi"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(ORDERS_LOCK_FILE, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _last_journal_line(file_path):
+    """Jurnalning oxirgi qatorini fayl oxiridan o'qiydi (O(1))"""
+    try:
+        with open(file_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            pos = end
+            chunk = b""
+            while pos > 0:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step) + chunk
+                lines = chunk.rstrip(b"\n").split(b"\n")
+                if len(lines) > 1 or pos == 0:
+                    return lines[-1] or None
+    except FileNotFoundError:
+        return None
+    return None
+
+def _snapshot_last_id():
+    try:
+        with open(ORDERS_SEQ_FILE, "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        pass
+    # Eski o'rnatishlar: seq fayl hali yo'q, snapshotdan hisoblaymiz
+    return max((_to_int(o.get("id")) for o in json_cache.read(ORDERS_FILE)), default=0)
+
+def _last_order_id():
+    line = _last_journal_line(ORDERS_LOG_FILE)
+    if line:
+        try:
+            return max(_to_int(json.loads(line).get("id")), _snapshot_last_id())
+        except ValueError:
+            pass
+    return _snapshot_last_id()
+
+def append_order(order):
+    """Buyurtmaga id beradi va uni jurnal oxiriga qo'shadi.
+
+    id qulf ostida beriladi, shuning uchun parallel checkoutlarda
+    buyurtmalar yo'qolmaydi va id takrorlanmaydi. Yozish narxi umumiy
+    buyurtmalar soniga bog'liq emas.
+    """
+    with orders_lock():
+        order["id"] = _last_order_id() + 1
+        line = json.dumps(order, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with open(ORDERS_LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+    return order
+
+class _JournalView:
+    """Jurnalni faqat yangi qo'shilgan qismini o'qib boradi"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inode = None
+        self._offset = 0
+        self._orders = []
+        self._body_key = None
+        self._body = None
+
+    def body(self, snapshot_body, orders):
+        """snapshot + jurnal uchun JSON baytlari (o'zgarmaguncha qayta ishlatiladi)"""
+        key = (id(snapshot_body), self._inode, self._offset)
+        if self._body_key != key:
+            self._body = dumps_bytes(orders)
+            self._body_key = key
+        return self._body
+
+    def read(self):
+        with self._lock:
+            try:
+                st = os.stat(ORDERS_LOG_FILE)
+            except FileNotFoundError:
+                self._inode, self._offset, self._orders = None, 0, []
+                return []
+            if st.st_ino != self._inode or st.st_size < self._offset:
+                self._inode, self._offset, self._orders = st.st_ino, 0, []
+            if st.st_size > self._offset:
+                with open(ORDERS_LOG_FILE, "rb") as f:
+                    f.seek(self._offset)
+                    data = f.read()
+                # Oxirgi to'liq yozilmagan qatorni keyingi safar o'qiymiz
+                complete = data[:data.rfind(b"\n") + 1]
+                for line in complete.splitlines():
+                    if line.strip():
+                        self._orders.append(json.loads(line))
+                self._offset += len(complete)
+            return list(self._orders)
+
+_journal = _JournalView()
+
+def read_orders():
+    """Barcha buyurtmalar: siqilgan snapshot + jurnal"""
+    snapshot = json_cache.read(ORDERS_FILE)
+    journal = _journal.read()
+    if not journal:
+        return snapshot
+    last_id = max((_to_int(o.get("id")) for o in snapshot[-1:]), default=0)
+    # Siqish vaqtida uzilish bo'lsa jurnalda takroriy yozuvlar qolishi mumkin
+    return snapshot + [o for o in journal if _to_int(o.get("id")) > last_id]
+
+def read_orders_bytes():
+    """GET /api/orders uchun tayyor JSON baytlari"""
+    snapshot_body = json_cache.read_bytes(ORDERS_FILE)
+    if not _journal.read():
+        return snapshot_body
+    return _journal.body(snapshot_body, read_orders())
+
+def compact_orders():
+    """Jurnalni orders.json snapshotiga qo'shib, jurnalni tozalaydi.
+
+    Eski buyurtmalar ham normallashtiriladi (rasmlarsiz elementlar).
+    """
+    with orders_lock():
+        orders = [normalize_order(order) for order in read_orders()]
+        json_cache.write(ORDERS_FILE, orders)
+        last_id = max((_to_int(o.get("id")) for o in orders), default=0)
+        tmp_path = f"{ORDERS_SEQ_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(last_id))
+        os.replace(tmp_path, ORDERS_SEQ_FILE)
+        # Yangi bo'sh fayl (yangi inode) - o'quvchilar jurnal almashganini sezadi
+        tmp_path = f"{ORDERS_LOG_FILE}.tmp"
+        open(tmp_path, "w").close()
+        os.replace(tmp_path, ORDERS_LOG_FILE)
+    return len(orders)
+
+if __name__ == "__main__":
+    before = os.path.getsize(ORDERS_FILE) if os.path.exists(ORDERS_FILE) else 0
+    count = compact_orders()
+    after = os.path.getsize(ORDERS_FILE) if os.path.exists(ORDERS_FILE) else 0
+    print(f"{count} ta buyurtma siqildi: {before} -> {after} bayt")
@@ -1,13 +1,65 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 import httpx
 import os
 from dotenv import load_dotenv
 
+import frontend
+
 load_dotenv()
 
-app = FastAPI()
+# dev - so'rovlar Vite dev serverga proksilanadi;
+# prod - frontend/dist dagi build shu jarayonning o'zidan beriladi
+PROXY_MODE = os.getenv("PROXY_MODE", "dev")
+
+# Frontend URL (Vite server)
+PROXY_TARGET = os.getenv("PROXY_TARGET", "http://localhost:5174").rstrip("/")
+
+# Hop-by-hop headerlar faqat bitta ulanishga tegishli - uzatilmaydi (RFC 9110 7.6.1)
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "trailers", "transfer-encoding", "upgrade",
+}
+
+def filter_headers(items, drop=()):
+    """Hop-by-hop va Connection da sanab o'tilgan headerlarni olib tashlaydi.
+    items - (nomi, qiymati) juftlari; takrorlanuvchi headerlar (Set-Cookie) saqlanadi."""
+    connection = {
+        token.strip().lower()
+        for key, value in items
+        if key.lower() == "connection"
+        for token in value.split(",")
+    }
+    skip = HOP_BY_HOP_HEADERS | connection | set(drop)
+    return [(key, value) for key, value in items if key.lower() not in skip]
+
+async def stream_body(upstream):
+    """Upstream javobini bo'laklab uzatadi; tugaganda (yoki mijoz uzilganda)
+    ulanish pool ga qaytariladi"""
+    try:
+        async for chunk in upstream.aiter_raw():
+            yield chunk
+    finally:
+        await upstream.aclose()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if PROXY_MODE == "prod":
+        yield
+        return
+    # Bitta umumiy klient - ulanishlar qayta ishlatiladi (keep-alive)
+    app.state.client = httpx.AsyncClient(
+        base_url=PROXY_TARGET,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+    yield
+    await app.state.client.aclose()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS sozlamalari
 app.add_middleware(
@@ -18,28 +70,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Proksi server
-@app.get("/{path:path}")
+# Production: build qilingan statik fayllar
+def static(path: str, request: Request):
+    return frontend.serve_static(frontend.FRONTEND_DIST, path, request)
+
+# Proksi server (development)
 async def proxy(path: str, request: Request):
-    # Frontend URL (Vite server)
-    target_url = f"http://localhost:5174/{path}"
-    
-    async with httpx.AsyncClient() as client:
-        # Ngrok headerlarini qo'shamiz
-        headers = {
-            "ngrok-skip-browser-warning": "true",
-            "User-Agent": "TelegramWebApp"
-        }
-        
-        # So'rovni yuborish
-        response = await client.get(target_url, headers=headers)
-        
-        return StreamingResponse(
-            response.iter_bytes(),
-            status_code=response.status_code,
-            headers=dict(response.headers)
-        )
+    client = request.app.state.client
+    headers = filter_headers(request.headers.items(), drop=("host", "user-agent"))
+    # Ngrok headerlarini qo'shamiz
+    headers += [
+        ("ngrok-skip-browser-warning", "true"),
+        ("user-agent", "TelegramWebApp"),
+        ("x-forwarded-for", request.client.host if request.client else ""),
+        ("x-forwarded-proto", request.url.scheme),
+        ("x-forwarded-host", request.headers.get("host", "")),
+    ]
+    upstream_request = client.build_request(
+        request.method,
+        httpx.URL(path="/" + path, query=request.url.query.encode("utf-8")),
+        headers=headers,
+        # So'rov tanasi ham oqim bo'lib uzatiladi
+        content=request.stream() if request.method not in ("GET", "HEAD") else None,
+    )
+
+    # So'rovni yuborish - javob tanasi o'qilmasdan, oqim sifatida
+    try:
+        upstream = await client.send(upstream_request, stream=True)
+    except httpx.TransportError as e:
+        print("Proxy upstream xatolik:", e)
+        return Response(status_code=502, content=b"Bad Gateway")
+
+    response = StreamingResponse(stream_body(upstream), status_code=upstream.status_code)
+    response.raw_headers = [
+        (key.encode("latin-1"), value.encode("latin-1"))
+        for key, value in filter_headers(upstream.headers.multi_items())
+    ]
+    return response
+
+if PROXY_MODE == "prod":
+    app.add_api_route("/{path:path}", static, methods=["GET", "HEAD"])
+else:
+    app.add_api_route("/{path:path}", proxy, methods=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
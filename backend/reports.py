@@ -0,0 +1,178 @@
+import asyncio
+import datetime
+import json
+import os
+
+import rollups
+from notifications import GROUP_CHAT_ID, TelegramNotifier, notifier
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+REPORT_WINDOWS_FILE = os.path.join(DATA_DIR, "report_windows.json")
+
+# Standart hisobot oraliqlari. data/report_windows.json (yoki REPORT_WINDOWS
+# muhit o'zgaruvchisi) shu formatdagi ro'yxat bilan ularni almashtiradi.
+DEFAULT_REPORT_WINDOWS = [
+    {"name": "Ertalab", "start": "07:00", "end": "10:00"},
+    {"name": "Kun o'rtasi", "start": "10:00", "end": "13:00"},
+    {"name": "Tushdan keyin", "start": "13:00", "end": "16:00"},
+    {"name": "Kechqurun", "start": "16:00", "end": "19:00"},
+    {"name": "Tungi", "start": "19:00", "end": "07:00"},
+]
+
+class ReportWindow:
+    """Kunlik hisobot oralig'i. Hisobot oraliq tugaganda yuboriladi;
+    start > end bo'lsa oraliq yarim tundan o'tadi (masalan 19:00-7:00)."""
+
+    def __init__(self, name, start, end):
+        self.name = name
+        self.start = datetime.time.fromisoformat(start)
+        self.end = datetime.time.fromisoformat(end)
+
+    @property
+    def label(self):
+        return f"{self.start.hour}:{self.start.minute:02d}-{self.end.hour}:{self.end.minute:02d}"
+
+    def range_ending(self, now):
+        """now gacha tugagan eng oxirgi oraliq: (start, end)"""
+        end = datetime.datetime.combine(now.date(), self.end)
+        if end > now:
+            end -= datetime.timedelta(days=1)
+        start = datetime.datetime.combine(end.date(), self.start)
+        if start >= end:
+            start -= datetime.timedelta(days=1)
+        return start, end
+
+def load_windows():
+    raw = os.getenv("REPORT_WINDOWS")
+    if raw:
+        windows = json.loads(raw)
+    elif os.path.exists(REPORT_WINDOWS_FILE):
+        with open(REPORT_WINDOWS_FILE, "r", encoding="utf-8") as f:
+            windows = json.load(f)
+    else:
+        windows = DEFAULT_REPORT_WINDOWS
+    return [ReportWindow(w["name"], w["start"], w["end"]) for w in windows]
+
+def compute(ranges):
+    """Bir nechta oraliq statistikasini bitta o'tishda hisoblaydi.
+
+    ranges - [(start, end), ...]. Umumiy oraliqdagi soatlik bucketlar bir
+    marta o'qiladi va mos keladigan har bir oraliqqa taqsimlanadi.
+    """
+    if not ranges:
+        return []
+    per_range = [[] for _ in ranges]
+    first = min(start for start, _ in ranges)
+    last = max(end for _, end in ranges)
+    for hour_start, bucket in rollups.iter_buckets(first, last):
+        for i, (start, end) in enumerate(ranges):
+            if start <= hour_start < end:
+                per_range[i].append(bucket)
+    return [rollups.summarize(buckets) for buckets in per_range]
+
+def render_stats(stats):
+    """Mahsulotlar / jami / mijozlar bloki (barcha hisobotlar uchun umumiy)"""
+    product_stats, total_sum, total_orders, customer_orders = stats
+    text = 'Mahsulotlar:\n'
+    for name, data in product_stats.items():
+        text += f'{name} — {data["quantity"]} dona, {data["total"]} so\'m\n'
+    text += f'\nJami buyurtmalar: {total_orders} ta\n'
+    text += f'Jami summa: {total_sum} so\'m\n'
+    if customer_orders:
+        text += '\nMijozlar:\n'
+        for customer_order in customer_orders:
+            text += f'- {customer_order}\n'
+    return text
+
+def render_period(window, stats):
+    if not stats[0]:
+        return f'{window.name} {window.label} oralig\'ida buyurtmalar yo\'q.'
+    return f'📊 {window.name} {window.label} oralig\'idagi buyurtmalar:\n\n' + render_stats(stats)
+
+def build_period_reports(windows, now=None):
+    """Berilgan oraliqlarning now gacha tugagan davrlari uchun matnlar"""
+    now = now or datetime.datetime.now()
+    ranges = [window.range_ending(now) for window in windows]
+    return [render_period(window, stats) for window, stats in zip(windows, compute(ranges))]
+
+def build_weekly_report():
+    """Barcha haftalar statistikasi (soatlik agregatlardan)"""
+    weeks = {}
+    for hour_start, bucket in rollups.iter_all_buckets():
+        year, week_num, _ = hour_start.isocalendar()
+        weeks.setdefault(f"{year}-yil, {week_num}-hafta", []).append(bucket)
+    all_stats = ""
+    for week_key in sorted(weeks.keys()):
+        stats = rollups.summarize(weeks[week_key])
+        all_stats += f"\n==============================\n"
+        all_stats += f"📅 {week_key} statistikasi:\n\n"
+        if not stats[0]:
+            all_stats += "Hafta davomida buyurtmalar yo'q.\n"
+        else:
+            all_stats += render_stats(stats)
+    return all_stats
+
+async def _send_texts(texts, sender=notifier):
+    for text in texts:
+        try:
+            await sender.send_message(text, chat_id=GROUP_CHAT_ID)
+        except Exception as e:
+            print("Statistika yuborishda xatolik:", e)
+
+async def _send_weekly(all_stats, sender=notifier):
+    try:
+        await sender.send_document(
+            "all_weeks_stats.txt", all_stats.encode("utf-8"),
+            caption="Barcha haftalar statistikasi", chat_id=GROUP_CHAT_ID,
+        )
+    except Exception as e:
+        print("Barcha haftalar statistikasi fayli xatolik:", e)
+
+def send_period_reports(names=None):
+    """Scheduler ishi: nomlari berilgan (yoki barcha) oraliqlar hisobotini yuboradi"""
+    windows = [w for w in load_windows() if names is None or w.name in names]
+    notifier.enqueue_threadsafe(_send_texts, build_period_reports(windows))
+
+def send_weekly_report():
+    all_stats = build_weekly_report()
+    # txt faylga yozamiz
+    with open(os.path.join(DATA_DIR, "all_weeks_stats.txt"), "w", encoding="utf-8") as f:
+        f.write(all_stats)
+    notifier.enqueue_threadsafe(_send_weekly, all_stats)
+
+def schedule_reports(scheduler):
+    """Oraliqlarni tugash vaqti bo'yicha guruhlab scheduler ga qo'shadi"""
+    by_end = {}
+    for window in load_windows():
+        by_end.setdefault(window.end, []).append(window.name)
+    for end, names in by_end.items():
+        scheduler.add_job(send_period_reports, 'cron', hour=end.hour, minute=end.minute, args=[names])
+    scheduler.add_job(send_weekly_report, 'cron', day_of_week='sun', hour=22, minute=0)  # Yakshanba 22:00 da
+
+async def backfill(days):
+    """O'tkazib yuborilgan kunlar hisobotlarini qayta yuboradi.
+
+    Barcha kunlar va oraliqlar bitta compute() o'tishida hisoblanadi.
+    """
+    pairs = []
+    for day in days:
+        day_end = datetime.datetime.combine(day, datetime.time.max)
+        pairs.extend((window, window.range_ending(day_end)) for window in load_windows())
+    stats = compute([r for _, r in pairs])
+    texts = [
+        f"📅 {end:%Y-%m-%d}\n" + render_period(window, s)
+        for (window, (_, end)), s in zip(pairs, stats)
+    ]
+    sender = TelegramNotifier()
+    await sender.start()
+    try:
+        await _send_texts(texts, sender)
+    finally:
+        await sender.stop()
+
+if __name__ == "__main__":
+    import sys
+
+    # python reports.py 2025-07-09 [2025-07-10 ...]
+    days = [datetime.date.fromisoformat(arg) for arg in sys.argv[1:]] or [datetime.date.today()]
+    asyncio.run(backfill(days))
@@ -0,0 +1,455 @@
+import asyncio
+import datetime
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, select
+from sqlalchemy.orm import selectinload
+from starlette.concurrency import run_in_threadpool
+
+from cache import dumps_bytes, json_cache
+from database import async_session, bump_catalog, init_db, CatalogState, Category, Order, OrderItem, Product, User
+from orders import append_order, order_created_at, read_orders, read_orders_bytes
+
+load_dotenv()
+# json - data/*.json fayllari, sqlite - database.py dagi modellar
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+PRODUCTS_FILE = os.path.join(DATA_DIR, "products.json")
+CATEGORIES_FILE = os.path.join(DATA_DIR, "categories.json")
+USERS_FILE = os.path.join(DATA_DIR, "users.json")
+ORDERS_FILE = os.path.join(DATA_DIR, "orders.json")
+
+def _int_id(value):
+    """JSON dagi string id ni SQL uchun int ga o'tkazadi (bo'lmasa None)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _in_range(order, start, end):
+    created_dt = order_created_at(order)
+    if created_dt is None:
+        return False
+    return (start is None or created_dt >= start) and (end is None or created_dt < end)
+
+def _json_predicate(filters):
+    """Ro'yxat filtrlari uchun predikat (JSON ombori)"""
+    checks = []
+    if filters.get("category_id") is not None:
+        checks.append(lambda r: str(r.get("category_id")) == str(filters["category_id"]))
+    if filters.get("in_stock") is not None:
+        checks.append(lambda r: bool(r.get("in_stock", True)) == filters["in_stock"])
+    if filters.get("status") is not None:
+        checks.append(lambda r: r.get("status") == filters["status"])
+    if filters.get("start") is not None or filters.get("end") is not None:
+        checks.append(lambda r: _in_range(r, filters.get("start"), filters.get("end")))
+    return lambda record: all(check(record) for check in checks)
+
+def _json_page(records, predicate, cursor, limit):
+    """Kursor - oldingi sahifaning oxirgi elementi id si (fayl tartibida)"""
+    start = 0
+    if cursor is not None:
+        start = len(records)
+        for i, record in enumerate(records):
+            if str(record.get("id")) == cursor:
+                start = i + 1
+                break
+    items = []
+    for i in range(start, len(records)):
+        if not predicate(records[i]):
+            continue
+        if limit is not None and len(items) == limit:
+            return items, str(items[-1].get("id"))
+        items.append(records[i])
+    return items, None
+
+def project(items, fields):
+    """fields= bo'yicha faqat so'ralgan maydonlarni qoldiradi"""
+    if not fields:
+        return items
+    return [{key: item[key] for key in fields if key in item} for item in items]
+
+class JsonRepository:
+    """data/*.json fayllari ustidagi ombor (fayl I/O threadpoolda)"""
+
+    async def startup(self):
+        pass
+
+    async def body(self, kind):
+        if kind == "orders":
+            return await run_in_threadpool(read_orders_bytes)
+        return await run_in_threadpool(json_cache.read_bytes, self._file(kind))
+
+    async def catalog_version(self, kind):
+        """(versiya, o'zgargan vaqt) - versiya fayl kontenti xeshi"""
+        return await run_in_threadpool(json_cache.version, self._file(kind))
+
+    def _file(self, kind):
+        return {
+            "products": PRODUCTS_FILE,
+            "categories": CATEGORIES_FILE,
+            "users": USERS_FILE,
+        }[kind]
+
+    def _append(self, kind, record):
+        records = json_cache.read(self._file(kind))
+        records.append(record)
+        json_cache.write(self._file(kind), records)
+        return record
+
+    def _delete(self, kind, record_id):
+        records = json_cache.read(self._file(kind))
+        kept = [r for r in records if str(r.get("id")) != str(record_id)]
+        json_cache.write(self._file(kind), kept)
+        return len(kept) != len(records)
+
+    async def list_products(self):
+        return await run_in_threadpool(json_cache.read, PRODUCTS_FILE)
+
+    async def get_product(self, product_id):
+        products = await self.list_products()
+        return next((p for p in products if str(p.get("id")) == str(product_id)), None)
+
+    async def add_product(self, product):
+        return await run_in_threadpool(self._append, "products", product)
+
+    async def delete_product(self, product_id):
+        return await run_in_threadpool(self._delete, "products", product_id)
+
+    async def list_categories(self):
+        return await run_in_threadpool(json_cache.read, CATEGORIES_FILE)
+
+    async def add_category(self, category):
+        return await run_in_threadpool(self._append, "categories", category)
+
+    async def delete_category(self, category_id):
+        return await run_in_threadpool(self._delete, "categories", category_id)
+
+    async def list_users(self):
+        return await run_in_threadpool(json_cache.read, USERS_FILE)
+
+    async def add_user(self, user):
+        return await run_in_threadpool(self._append, "users", user)
+
+    async def list_orders(self, start=None, end=None):
+        orders = await run_in_threadpool(read_orders)
+        if start is None and end is None:
+            return orders
+        return [o for o in orders if _in_range(o, start, end)]
+
+    async def add_order(self, order):
+        order["created_at"] = datetime.datetime.now().isoformat()
+        return await run_in_threadpool(append_order, order)
+
+    async def page(self, kind, filters, cursor=None, limit=None):
+        """Filtrlangan sahifa: (elementlar, keyingi kursor)"""
+        loader = {
+            "products": self.list_products,
+            "categories": self.list_categories,
+            "users": self.list_users,
+            "orders": self.list_orders,
+        }[kind]
+        return _json_page(await loader(), _json_predicate(filters), cursor, limit)
+
+class SqlRepository:
+    """database.py modellari ustidagi ombor (async sessiyalar)"""
+
+    async def startup(self):
+        await init_db()
+
+    async def body(self, kind):
+        loader = {
+            "products": self.list_products,
+            "categories": self.list_categories,
+            "users": self.list_users,
+            "orders": self.list_orders,
+        }[kind]
+        return dumps_bytes(await loader())
+
+    async def catalog_version(self, kind):
+        """(versiya, o'zgargan vaqt) - versiya yozishlarda oshiriladigan generation"""
+        async with async_session() as session:
+            state = await session.get(CatalogState, kind)
+        if state is None:
+            return "0", 0.0
+        modified = state.updated_at.replace(tzinfo=datetime.timezone.utc).timestamp() if state.updated_at else 0.0
+        return str(state.generation), modified
+
+    @staticmethod
+    def product_to_dict(product):
+        return {
+            "id": str(product.id),
+            "name": product.name,
+            "description": product.description or "",
+            "price": product.price or 0,
+            "original_price": product.original_price or 0,
+            "discount": product.discount or 0,
+            "image": product.image or "",
+            "category_id": str(product.category_id) if product.category_id is not None else None,
+            "in_stock": product.in_stock,
+            "rating": product.rating or 0,
+            "reviews_count": product.reviews_count or 0,
+            "tannarxi": product.tannarxi or 0,
+        }
+
+    @staticmethod
+    def category_to_dict(category):
+        return {
+            "id": str(category.id),
+            "name": category.name or "",
+            "icon": category.icon or "",
+            "image": category.image or "",
+            "productCount": category.product_count or 0,
+        }
+
+    @staticmethod
+    def user_to_dict(user):
+        return {
+            "id": str(user.telegram_id or user.id),
+            "name": user.full_name or "",
+            "username": user.username,
+            "phone": user.phone or "",
+            "address": user.address or "",
+            "isAdmin": bool(user.is_admin),
+        }
+
+    @staticmethod
+    def order_to_dict(order):
+        return {
+            "id": order.id,
+            "items": [
+                {
+                    "product_id": str(item.product_id or ""),
+                    "name": item.name or "",
+                    "price": int(item.price or 0),
+                    "quantity": item.quantity or 0,
+                }
+                for item in order.items
+            ],
+            "total": order.total_amount or 0,
+            "status": order.status,
+            "customerInfo": {
+                "name": order.customer_name or "",
+                "phone": order.phone or "",
+                "address": order.address or "",
+                "location": order.location or "",
+            },
+            "created_at": order.created_at.isoformat() if order.created_at else None,
+        }
+
+    async def list_products(self):
+        async with async_session() as session:
+            result = await session.scalars(select(Product).order_by(Product.id))
+            return [self.product_to_dict(p) for p in result]
+
+    async def get_product(self, product_id):
+        product_id = _int_id(product_id)
+        if product_id is None:
+            return None
+        async with async_session() as session:
+            product = await session.get(Product, product_id)
+            return self.product_to_dict(product) if product else None
+
+    async def add_product(self, product):
+        async with async_session() as session:
+            row = Product(
+                id=_int_id(product.get("id")),
+                name=product.get("name"),
+                description=product.get("description", ""),
+                price=float(product.get("price") or 0),
+                original_price=float(product.get("original_price") or 0),
+                discount=int(float(product.get("discount") or 0)),
+                image=product.get("image", ""),
+                category_id=_int_id(product.get("category_id")),
+                in_stock=bool(product.get("in_stock", True)),
+                rating=float(product.get("rating") or 0),
+                reviews_count=int(product.get("reviews_count") or 0),
+                tannarxi=float(product.get("tannarxi") or 0),
+            )
+            session.add(row)
+            await bump_catalog(session, "products")
+            await session.commit()
+            return self.product_to_dict(row)
+
+    async def delete_product(self, product_id):
+        async with async_session() as session:
+            result = await session.execute(delete(Product).where(Product.id == _int_id(product_id)))
+            await bump_catalog(session, "products")
+            await session.commit()
+            return result.rowcount > 0
+
+    async def list_categories(self):
+        async with async_session() as session:
+            result = await session.scalars(select(Category).order_by(Category.id))
+            return [self.category_to_dict(c) for c in result]
+
+    async def add_category(self, category):
+        async with async_session() as session:
+            row = Category(
+                id=_int_id(category.get("id")),
+                name=category.get("name", ""),
+                icon=category.get("icon", ""),
+                image=category.get("image", ""),
+                product_count=int(category.get("productCount") or 0),
+            )
+            session.add(row)
+            await bump_catalog(session, "categories")
+            await session.commit()
+            return self.category_to_dict(row)
+
+    async def delete_category(self, category_id):
+        async with async_session() as session:
+            result = await session.execute(delete(Category).where(Category.id == _int_id(category_id)))
+            await bump_catalog(session, "categories")
+            await session.commit()
+            return result.rowcount > 0
+
+    async def list_users(self):
+        async with async_session() as session:
+            result = await session.scalars(select(User).order_by(User.id))
+            return [self.user_to_dict(u) for u in result]
+
+    async def add_user(self, user):
+        async with async_session() as session:
+            row = User(
+                telegram_id=_int_id(user.get("telegram_id") or user.get("id")),
+                username=user.get("username"),
+                full_name=user.get("name") or user.get("full_name"),
+                phone=user.get("phone"),
+                address=user.get("address"),
+                is_admin=bool(user.get("isAdmin", False)),
+            )
+            session.add(row)
+            await session.commit()
+            return self.user_to_dict(row)
+
+    async def list_orders(self, start=None, end=None):
+        query = select(Order).options(selectinload(Order.items)).order_by(Order.id)
+        if start is not None:
+            query = query.where(Order.created_at >= start)
+        if end is not None:
+            query = query.where(Order.created_at < end)
+        async with async_session() as session:
+            result = await session.scalars(query)
+            return [self.order_to_dict(o) for o in result]
+
+    async def add_order(self, order):
+        customer = order.get("customerInfo", {})
+        async with async_session() as session:
+            row = Order(
+                status=order.get("status", "pending"),
+                total_amount=float(order.get("total") or 0),
+                customer_name=customer.get("name"),
+                address=customer.get("address"),
+                location=customer.get("location"),
+                phone=customer.get("phone"),
+                created_at=datetime.datetime.now(),
+                items=[
+                    OrderItem(
+                        product_id=_int_id(item.get("product_id")),
+                        name=item.get("name"),
+                        quantity=item.get("quantity"),
+                        price=item.get("price"),
+                    )
+                    for item in order.get("items", [])
+                ],
+            )
+            session.add(row)
+            await session.commit()
+            order["id"] = row.id
+            order["created_at"] = row.created_at.isoformat()
+            return order
+
+    async def page(self, kind, filters, cursor=None, limit=None):
+        """Filtrlangan sahifa: (elementlar, keyingi kursor). Kursor - id
+        bo'yicha keyset, shuning uchun har bir sahifa indeks orqali o'qiladi."""
+        model, to_dict = {
+            "products": (Product, self.product_to_dict),
+            "categories": (Category, self.category_to_dict),
+            "users": (User, self.user_to_dict),
+            "orders": (Order, self.order_to_dict),
+        }[kind]
+        query = select(model).order_by(model.id)
+        if model is Order:
+            query = query.options(selectinload(Order.items))
+        if filters.get("category_id") is not None:
+            query = query.where(Product.category_id == _int_id(filters["category_id"]))
+        if filters.get("in_stock") is not None:
+            query = query.where(Product.in_stock == filters["in_stock"])
+        if filters.get("status") is not None:
+            query = query.where(Order.status == filters["status"])
+        if filters.get("start") is not None:
+            query = query.where(Order.created_at >= filters["start"])
+        if filters.get("end") is not None:
+            query = query.where(Order.created_at < filters["end"])
+        if cursor is not None:
+            query = query.where(model.id > (_int_id(cursor) or 0))
+        if limit is not None:
+            query = query.limit(limit + 1)
+        async with async_session() as session:
+            rows = list(await session.scalars(query))
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = str(rows[-1].id)
+        return [to_dict(row) for row in rows], next_cursor
+
+    async def import_json(self):
+        """data/*.json dagi ma'lumotlarni SQLite ga yuklaydi"""
+        json_repo = JsonRepository()
+        await self.startup()
+        async with async_session() as session:
+            for model in (Order, Product, Category, User):
+                if await session.scalar(select(model.id).limit(1)) is not None:
+                    raise RuntimeError(f"{model.__tablename__} jadvali bo'sh emas, import to'xtatildi")
+        counts = {}
+        for category in await json_repo.list_categories():
+            await self.add_category(category)
+        counts["categories"] = len(await json_repo.list_categories())
+        for product in await json_repo.list_products():
+            await self.add_product(product)
+        counts["products"] = len(await json_repo.list_products())
+        for user in await json_repo.list_users():
+            await self.add_user(user)
+        counts["users"] = len(await json_repo.list_users())
+        orders = await json_repo.list_orders()
+        async with async_session() as session:
+            for order in orders:
+                created_at = order_created_at(order)
+                customer = order.get("customerInfo", {})
+                session.add(Order(
+                    id=_int_id(order.get("id")),
+                    status=order.get("status", "pending"),
+                    total_amount=float(order.get("total") or 0),
+                    customer_name=customer.get("name"),
+                    address=customer.get("address"),
+                    location=customer.get("location"),
+                    phone=customer.get("phone"),
+                    created_at=created_at,
+                    items=[
+                        OrderItem(
+                            product_id=_int_id(item.get("product_id") or item.get("id")),
+                            name=item.get("name"),
+                            quantity=int(float(item.get("quantity") or 1)),
+                            price=float(item.get("price") or 0),
+                        )
+                        for item in order.get("items", [])
+                    ],
+                ))
+            await session.commit()
+        counts["orders"] = len(orders)
+        return counts
+
+_repository = None
+
+def get_repository():
+    global _repository
+    if _repository is None:
+        _repository = SqlRepository() if STORAGE_BACKEND == "sqlite" else JsonRepository()
+    return _repository
+
+if __name__ == "__main__":
+    counts = asyncio.run(SqlRepository().import_json())
+    print("SQLite ga yuklandi:", counts)
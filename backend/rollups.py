@@ -0,0 +1,147 @@
+import datetime
+import fcntl
+import os
+from contextlib import contextmanager
+
+from cache import json_cache
+from orders import order_created_at
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+ROLLUPS_DIR = os.path.join(DATA_DIR, "rollups")
+ROLLUPS_LOCK_FILE = os.path.join(DATA_DIR, "rollups.lock")
+
+# Kunlik fayl: data/rollups/YYYY-MM-DD.json
+# {"HH": {"products": {nomi: {"quantity", "total"}}, "total": summa,
+#         "orders": [{"id", "customer", "items": [[nomi, soni], ...]}]}}
+
+def _day_file(day):
+    return os.path.join(ROLLUPS_DIR, f"{day.isoformat()}.json")
+
+@contextmanager
+def _rollups_lock():
+    os.makedirs(ROLLUPS_DIR, exist_ok=True)
+    with open(ROLLUPS_LOCK_FILE, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _read_day(day):
+    path = _day_file(day)
+    if not os.path.exists(path):
+        return {}
+    return json_cache.read(path)
+
+def _add_to_bucket(bucket, order):
+    order_items = []
+    for item in order.get("items", []):
+        name = item.get("name", "")
+        quantity = int(item.get("quantity", 1))
+        item_total = quantity * int(item.get("price", 0))
+        stats = bucket["products"].setdefault(name, {"quantity": 0, "total": 0})
+        stats["quantity"] += quantity
+        stats["total"] += item_total
+        bucket["total"] += item_total
+        order_items.append([name, item.get("quantity", 1)])
+    bucket["orders"].append({
+        "id": order.get("id", "N/A"),
+        "customer": order.get("customerInfo", {}).get("name", "Noma'lum"),
+        "items": order_items,
+    })
+
+def _empty_bucket():
+    return {"products": {}, "total": 0, "orders": []}
+
+def record_order(order):
+    """Yangi buyurtmani soatlik agregatga qo'shadi (faqat bitta kun fayli yoziladi)"""
+    created = order_created_at(order)
+    if created is None:
+        return
+    day = created.date()
+    with _rollups_lock():
+        # Keshdagi obyektni o'zgartirmaslik uchun nusxa
+        buckets = {hour: _copy_bucket(b) for hour, b in _read_day(day).items()}
+        bucket = buckets.setdefault(f"{created.hour:02d}", _empty_bucket())
+        _add_to_bucket(bucket, order)
+        json_cache.write(_day_file(day), buckets)
+
+def _copy_bucket(bucket):
+    return {
+        "products": {name: dict(stats) for name, stats in bucket["products"].items()},
+        "total": bucket["total"],
+        "orders": list(bucket["orders"]),
+    }
+
+def iter_buckets(start, end):
+    """[start, end) oralig'idagi soatlik bucketlar: (soat boshi, bucket)"""
+    day = start.date()
+    while datetime.datetime.combine(day, datetime.time()) < end:
+        for hour, bucket in sorted(_read_day(day).items()):
+            hour_start = datetime.datetime.combine(day, datetime.time(int(hour)))
+            if start <= hour_start < end:
+                yield hour_start, bucket
+        day += datetime.timedelta(days=1)
+
+def all_days():
+    if not os.path.isdir(ROLLUPS_DIR):
+        return []
+    days = []
+    for name in os.listdir(ROLLUPS_DIR):
+        if name.endswith(".json"):
+            try:
+                days.append(datetime.date.fromisoformat(name[:-5]))
+            except ValueError:
+                continue
+    return sorted(days)
+
+def iter_all_buckets():
+    for day in all_days():
+        for hour, bucket in sorted(_read_day(day).items()):
+            yield datetime.datetime.combine(day, datetime.time(int(hour))), bucket
+
+def summarize(buckets):
+    """Bucketlarni get_time_period_stats formatiga yig'adi:
+    (product_stats, total_sum, total_orders, customer_orders)"""
+    product_stats = {}
+    total_sum = 0
+    customer_orders = []
+    for bucket in buckets:
+        for name, stats in bucket["products"].items():
+            merged = product_stats.setdefault(name, {"quantity": 0, "total": 0})
+            merged["quantity"] += stats["quantity"]
+            merged["total"] += stats["total"]
+        total_sum += bucket["total"]
+        for order in bucket["orders"]:
+            items_str = ', '.join(f"{name} — {quantity} dona" for name, quantity in order["items"])
+            customer_orders.append(f"{order['customer']} (#{order['id']}): {items_str}")
+    return product_stats, total_sum, len(customer_orders), customer_orders
+
+def window_stats(start, end):
+    """Vaqt oralig'i statistikasi - faqat kerakli soatlik bucketlar o'qiladi"""
+    return summarize(bucket for _, bucket in iter_buckets(start, end))
+
+def rebuild(orders):
+    """Barcha agregatlarni buyurtmalar tarixidan qaytadan quradi"""
+    days = {}
+    for order in orders:
+        created = order_created_at(order)
+        if created is None:
+            continue
+        buckets = days.setdefault(created.date(), {})
+        _add_to_bucket(buckets.setdefault(f"{created.hour:02d}", _empty_bucket()), order)
+    with _rollups_lock():
+        for day in all_days():
+            if day not in days:
+                os.remove(_day_file(day))
+                json_cache.invalidate(_day_file(day))
+        for day, buckets in days.items():
+            json_cache.write(_day_file(day), dict(sorted(buckets.items())))
+    return len(days)
+
+if __name__ == "__main__":
+    import asyncio
+    from repository import get_repository
+
+    count = rebuild(asyncio.run(get_repository().list_orders()))
+    print(f"{count} kunlik agregat qayta qurildi")
@@ -0,0 +1,46 @@
+"""API, Telegram bot va scheduler ni bitta jarayonda, bitta event loop da
+ishga tushiradi:
+
+    python run.py
+
+API main.app orqali (lifespan: repository, notifier, scheduler) ishlaydi.
+Bot BOT_MODE=polling (standart) da bot.dp polling bilan, BOT_MODE=webhook
+da API ning o'zidagi webhook manzili orqali ishlaydi. Bir nechta nusxa
+ishga tushirilsa cron ishlarini faqat scheduler.lock ni olgan nusxa
+bajaradi; polling esa faqat bitta nusxada yoqilishi kerak (qolganlarida
+BOT_MODE=off yoki webhook).
+"""
+import asyncio
+import os
+
+import uvicorn
+from dotenv import load_dotenv
+
+from main import BOT_MODE, app
+
+load_dotenv()
+
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("API_PORT", "8001"))
+
+async def main():
+    server = uvicorn.Server(uvicorn.Config(app, host=API_HOST, port=API_PORT))
+    polling = None
+    if BOT_MODE == "polling":
+        from bot import dp, main as bot_main
+
+        # Signallarni uvicorn ushlaydi; polling server bilan birga to'xtatiladi
+        polling = asyncio.create_task(bot_main(handle_signals=False))
+    try:
+        await server.serve()
+    finally:
+        if polling is not None:
+            if not polling.done():
+                try:
+                    await dp.stop_polling()
+                except RuntimeError:  # polling hali boshlanmagan
+                    polling.cancel()
+            await asyncio.gather(polling, return_exceptions=True)
+
+if __name__ == "__main__":
+    asyncio.run(main())
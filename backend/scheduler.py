@@ -0,0 +1,95 @@
+import asyncio
+import fcntl
+import os
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+import reports
+from orders import compact_orders
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+LEADER_LOCK_FILE = os.path.join(DATA_DIR, "scheduler.lock")
+# Leader bo'lmagan jarayonlar shu oraliqda lock ni qayta tekshiradi
+LEADER_RETRY_SECONDS = 30
+
+class LeaderLock:
+    """Bir nechta worker orasida bitta leader tanlash uchun fayl lock.
+
+    flock jarayon tugaganda (hatto kill -9 da ham) avtomatik bo'shaydi,
+    shuning uchun leader o'lsa boshqa worker keyingi urinishda o'rnini oladi.
+    """
+
+    def __init__(self, path=LEADER_LOCK_FILE):
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        if self._file is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+def create_scheduler():
+    scheduler = AsyncIOScheduler()
+    # Davriy statistika hisobotlari (oraliqlar reports.load_windows() da)
+    reports.schedule_reports(scheduler)
+    scheduler.add_job(compact_orders, 'cron', hour=3, minute=30)  # Har kuni 3:30 da buyurtmalar jurnalini siqish
+    return scheduler
+
+class LeaderScheduler:
+    """Cron ishlarini faqat leader lock ni olgan jarayonda ishga tushiradi.
+
+    Har bir worker start() chaqiradi; lock ni olgan bittasi scheduler ni
+    boshlaydi, qolganlari kutib turadi. Shunday qilib hisobotlar nechta
+    worker bo'lishidan qat'i nazar bir marta yuboriladi.
+    """
+
+    def __init__(self, lock=None):
+        self.lock = lock or LeaderLock()
+        self.scheduler = None
+        self._task = None
+
+    @property
+    def is_leader(self):
+        return self.scheduler is not None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._elect())
+
+    async def _elect(self):
+        while not self.lock.acquire():
+            await asyncio.sleep(LEADER_RETRY_SECONDS)
+        self.scheduler = create_scheduler()
+        self.scheduler.start()
+        print(f"Scheduler leader: pid {os.getpid()}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.scheduler is not None:
+            self.scheduler.shutdown(wait=False)
+            self.scheduler = None
+        self.lock.release()
+
+scheduler = LeaderScheduler()
@@ -0,0 +1,66 @@
+"""Lokal Telegram Bot API stub (test va benchmarklar uchun).
+
+Ishga tushirish:
+    uvicorn telegram_stub:app --port 8081
+    TELEGRAM_API_URL=http://127.0.0.1:8081 python main.py
+
+STUB_LATENCY - har bir javobdan oldin kutish (soniya),
+STUB_FAIL_RATE - 0..1, shu ulushdagi so'rovlarga 502 qaytariladi.
+"""
+import asyncio
+import os
+import random
+import re
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+STUB_LATENCY = float(os.getenv("STUB_LATENCY", "0"))
+STUB_FAIL_RATE = float(os.getenv("STUB_FAIL_RATE", "0"))
+
+app = FastAPI()
+calls = []
+_message_id = 0
+
+# aiogram multipart yuboradi; python-multipart ga bog'lanmaslik uchun regex
+CHAT_ID_RE = re.compile(rb'name="chat_id"\r\n\r\n(-?\d+)|"chat_id":\s*(-?\d+)')
+
+def _chat_id(body):
+    """So'rov tanasidagi chat_id (JSON yoki multipart)"""
+    match = CHAT_ID_RE.search(body)
+    return int(match.group(1) or match.group(2)) if match else 0
+
+@app.post("/bot{token}/{method}")
+async def bot_method(token: str, method: str, request: Request):
+    global _message_id
+    if STUB_LATENCY:
+        await asyncio.sleep(STUB_LATENCY)
+    body = await request.body()
+    calls.append({"method": method, "size": len(body), "time": time.time()})
+    if STUB_FAIL_RATE and random.random() < STUB_FAIL_RATE:
+        return JSONResponse({"ok": False, "description": "stub failure"}, status_code=502)
+    # aiogram javob turini tekshiradi: set*/delete*/answer* - bool, getMe - User
+    if method.startswith(("set", "delete", "answer")):
+        return {"ok": True, "result": True}
+    if method == "getMe":
+        return {"ok": True, "result": {"id": 1, "is_bot": True, "first_name": "stub"}}
+    _message_id += 1
+    return {"ok": True, "result": {
+        "message_id": _message_id,
+        "date": int(time.time()),
+        "chat": {"id": _chat_id(body), "type": "private"},
+    }}
+
+@app.get("/calls")
+async def get_calls():
+    """Qabul qilingan so'rovlar (metod bo'yicha sanoq bilan)"""
+    counts = {}
+    for call in calls:
+        counts[call["method"]] = counts.get(call["method"], 0) + 1
+    return {"total": len(calls), "methods": counts}
+
+@app.delete("/calls")
+async def reset_calls():
+    calls.clear()
+    return {"ok": True}
@@ -0,0 +1,86 @@
+import asyncio
+import hmac
+import os
+from collections import OrderedDict
+
+from aiogram.types import Update
+from fastapi import APIRouter, HTTPException, Request
+
+from bot import bot, dp
+
+# Telegram webhookni shu manzilga yuboradi: WEBHOOK_URL + WEBHOOK_PATH
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "").rstrip("/")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram/webhook")
+# setWebhook(secret_token=...) - Telegram har so'rovda shu headerni yuboradi
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+SECRET_HEADER = "x-telegram-bot-api-secret-token"
+# Telegram javob olmasa update ni qayta yuboradi - oxirgi id lar eslab qolinadi
+DEDUP_SIZE = 10000
+
+class UpdateDeduplicator:
+    """Oxirgi ko'rilgan update_id larning LRU to'plami"""
+
+    def __init__(self, size=DEDUP_SIZE):
+        self.size = size
+        self._seen = OrderedDict()
+        self.duplicates = 0
+
+    def seen(self, update_id):
+        """update_id oldin kelgan bo'lsa True, aks holda eslab qoladi"""
+        if update_id in self._seen:
+            self._seen.move_to_end(update_id)
+            self.duplicates += 1
+            return True
+        self._seen[update_id] = None
+        if len(self._seen) > self.size:
+            self._seen.popitem(last=False)
+        return False
+
+router = APIRouter()
+deduplicator = UpdateDeduplicator()
+_tasks = set()
+
+async def _feed(update):
+    try:
+        await dp.feed_update(bot, update)
+    except Exception as e:
+        print(f"ERROR: update {update.update_id} bajarilmadi: {e}")
+
+@router.post(WEBHOOK_PATH)
+async def telegram_webhook(request: Request):
+    """Telegram update larini qabul qiladi va dispatcher ga fonda uzatadi.
+
+    Telegramga darhol javob qaytariladi; handlerlar alohida taskda ishlaydi.
+    """
+    token = request.headers.get(SECRET_HEADER, "")
+    if not WEBHOOK_SECRET or not hmac.compare_digest(token, WEBHOOK_SECRET):
+        raise HTTPException(status_code=401, detail="Noto'g'ri secret token")
+    data = await request.json()
+    update_id = data.get("update_id")
+    if update_id is None or deduplicator.seen(update_id):
+        return {"ok": True}
+    update = Update.model_validate(data, context={"bot": bot})
+    task = asyncio.create_task(_feed(update))
+    # Task tugaguncha havola saqlanadi (aks holda GC yo'qotishi mumkin)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return {"ok": True}
+
+async def setup_webhook():
+    """Telegramga webhook manzilini ro'yxatdan o'tkazadi"""
+    if not WEBHOOK_SECRET:
+        raise RuntimeError("BOT_MODE=webhook uchun WEBHOOK_SECRET kerak")
+    if not WEBHOOK_URL:
+        print("ERROR: WEBHOOK_URL berilmagan - setWebhook chaqirilmadi")
+        return
+    await bot.set_webhook(
+        WEBHOOK_URL + WEBHOOK_PATH,
+        secret_token=WEBHOOK_SECRET,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
+
+async def shutdown_webhook(timeout=10.0):
+    """Ishlayotgan handlerlarni kutadi va bot sessiyasini yopadi"""
+    if _tasks:
+        await asyncio.wait(list(_tasks), timeout=timeout)
+    await bot.session.close()